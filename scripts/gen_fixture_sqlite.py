@@ -7,41 +7,62 @@ Run:  python scripts/gen_fixture_sqlite.py
 
 from __future__ import annotations
 
-import csv
-import re
 import sqlite3
 import sys
 from pathlib import Path
 
+try:
+    import polars as pl
+except ModuleNotFoundError as exc:  # pragma: no cover - dependency wiring guard
+    raise ModuleNotFoundError(
+        "`scripts/gen_fixture_sqlite.py` requires optional dependency 'polars'. "
+        'Install with `uv pip install "polli-typus[loader]"`.'
+    ) from exc
+
 ROOT = Path(__file__).resolve().parent.parent
-TSV_DIR = ROOT / "tests" / "sample_tsv"
-TYPUS_CONSTANTS_PATH = ROOT / "typus" / "constants.py"  # Path to typus constants
-DB_PATH = ROOT / "tests" / "expanded_taxa_sample.sqlite"
+# Let the script run from a plain checkout without installing the package first.
+sys.path.insert(0, str(ROOT))
 
-INT_RE = re.compile(r"^-?\d+$")
+from typus.constants import MAJOR_LEVELS, RankLevel  # noqa: E402
+from typus.services.sqlite_loader import (  # noqa: E402
+    EXPANDED_TAXA_INDEXES,
+    TAXON_ACTIVE_TRUE,
+)
 
+TSV_DIR = ROOT / "tests" / "sample_tsv"
+DB_PATH = ROOT / "tests" / "expanded_taxa_sample.sqlite"
 
-def sql_type(val: str | None) -> str:
-    return "INTEGER" if val is not None and INT_RE.fullmatch(val) else "TEXT"
+FIXTURE_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
+INSERT_BATCH_ROWS = 10_000
+
+# Explicit column types (in output order) for tables whose shape this script owns;
+# any other TSV gets its types inferred from every row by ``infer_column_types``.
+SCHEMA_HINTS: dict[str, dict[str, str]] = {
+    "expanded_taxa": {
+        "taxonID": "INTEGER",
+        "rankLevel": "INTEGER",
+        "rank": "TEXT",
+        "name": "TEXT",
+        "taxonActive": "INTEGER",  # 0 or 1
+        "commonName": "TEXT",
+        "immediateAncestor_taxonID": "INTEGER",
+        "immediateAncestor_rankLevel": "INTEGER",
+        "immediateMajorAncestor_taxonID": "INTEGER",
+        "immediateMajorAncestor_rankLevel": "INTEGER",
+        # ancestry column removed - no longer generated
+    },
+}
 
 
 def q(name: str) -> str:  # quote identifier
     return f'"{name}"'
 
 
-# Dynamically load RankLevel and MAJOR_LEVELS from typus.constants
-def _load_typus_constants():
-    import importlib.util
-
-    spec = importlib.util.spec_from_file_location("typus.constants", TYPUS_CONSTANTS_PATH)
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Could not load typus.constants from {TYPUS_CONSTANTS_PATH}")
-    constants_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(constants_module)
-    return constants_module.RankLevel, constants_module.MAJOR_LEVELS
-
-
-RankLevel, MAJOR_LEVELS = _load_typus_constants()
 ALL_RANK_ENUMS_SORTED_ASC = sorted(
     list(RankLevel), key=lambda r: r.value
 )  # Sort by rank value, low to high
@@ -49,274 +70,187 @@ ALL_RANK_ENUMS_SORTED_DESC = sorted(
     list(RankLevel), key=lambda r: r.value, reverse=True
 )  # Sort by rank value, high to low
 MAJOR_RANK_VALUES = {rl.value for rl in MAJOR_LEVELS}
+# TSV column prefix per rank value (half-levels use an underscore, e.g. L33_5)
+PREFIX_BY_RANK = {
+    r.value: "L33_5" if r.value == 335 else "L34_5" if r.value == 345 else f"L{r.value}"
+    for r in RankLevel
+}
+TAXONID_COL = {v: f"{pfx}_taxonID" for v, pfx in PREFIX_BY_RANK.items()}
+ASC_RANK_VALUES = [r.value for r in ALL_RANK_ENUMS_SORTED_ASC]
+
+
+def insert_statement(table: str, columns: list[str]) -> str:
+    placeholders = ", ".join("?" for _ in columns)
+    return f"INSERT INTO {q(table)} ({', '.join(map(q, columns))}) VALUES ({placeholders});"
+
+
+def create_table(conn: sqlite3.Connection, table: str, col_types: dict[str, str]) -> None:
+    conn.execute(f"DROP TABLE IF EXISTS {q(table)};")
+    cols_ddl = ", ".join(f"{q(col)} {typ}" for col, typ in col_types.items())
+    conn.execute(f"CREATE TABLE {q(table)} ({cols_ddl});")
+
+
+def infer_column_types(frame: pl.DataFrame) -> dict[str, str]:
+    """A column is INTEGER only if every non-empty value in it is an integer literal."""
+    int_ok = frame.select(
+        (pl.col(c).str.contains(r"^-?\d+$") | (pl.col(c) == "")).all() for c in frame.columns
+    ).row(0)
+    return {col: "INTEGER" if ok else "TEXT" for col, ok in zip(frame.columns, int_ok)}
+
+
+def load_table(conn: sqlite3.Connection, table: str, src: Path) -> None:
+    # Parse with Polars' native reader rather than Python's csv module. SQLite's csv
+    # virtual table would be the other in-C option, but it only reads comma-separated
+    # files and is not bundled with Python's sqlite3.
+    try:
+        frame = pl.read_csv(src, separator="\t", infer_schema=False)
+    except pl.exceptions.NoDataError:
+        return
+    if frame.height == 0:
+        return
+    # Empty fields come back as null; keep them as "" like the csv module did. Done
+    # here rather than via a read_csv flag, whose name changed in Polars 1.43.
+    frame = frame.with_columns(pl.all().fill_null(""))
+
+    col_types = SCHEMA_HINTS.get(table) or infer_column_types(frame)
+    create_table(conn, table, {col: col_types.get(col, "TEXT") for col in frame.columns})
+    insert_sql = insert_statement(table, frame.columns)
+    conn.execute("BEGIN")
+    for batch in frame.iter_slices(n_rows=INSERT_BATCH_ROWS):
+        conn.executemany(insert_sql, batch.rows())
+    conn.commit()
 
 
-def load_table(cur: sqlite3.Cursor, table: str, src: Path) -> None:
-    with src.open(newline="") as fh:
-        reader = csv.DictReader(fh, delimiter="\t")
-        rows = list(reader)
-        if not rows:
-            return
-        header = reader.fieldnames or []
-
-    cols_ddl = ", ".join(f"{q(col)} {sql_type(rows[0][col])}" for col in header)
-    cur.execute(f"CREATE TABLE {q(table)} ({cols_ddl});")
-
-    placeholders = ", ".join("?" for _ in header)
-    insert = f"INSERT INTO {q(table)} ({', '.join(map(q, header))}) VALUES ({placeholders});"
-    cur.executemany(insert, [[row[col] for col in header] for row in rows])
-
-
-def get_parent_info(row_dict: dict) -> tuple[int | None, int | None, int | None, int | None]:
-    current_rank_val = int(row_dict["rankLevel"])  # TSV stores rankLevel as int string
-    true_parent_id: int | None = None
-    true_parent_rank_level: int | None = None
-    major_parent_id: int | None = None
-    major_parent_rank_level: int | None = None
-
-    # True Parent: Smallest rank_value > current_rank_val that has a non-null taxon_id in this row's L{X}_taxonID columns
-    parent_candidates = []
-    for r_enum_cand in ALL_RANK_ENUMS_SORTED_ASC:  # Iterate from lowest rank value up
-        cand_r_val = r_enum_cand.value
-        if cand_r_val > current_rank_val:  # Parent rank value must be larger
-            db_col_val_str = str(cand_r_val)
-            if cand_r_val == 335:
-                prefix = "L33_5"  # Match TSV column names
-            elif cand_r_val == 345:
-                prefix = "L34_5"
-            else:
-                prefix = f"L{db_col_val_str}"
-
-            tid_at_cand_rank = row_dict.get(f"{prefix}_taxonID")
-            if tid_at_cand_rank is not None and str(tid_at_cand_rank).strip() not in ["", "NULL"]:
-                try:
-                    parent_candidates.append({"id": int(tid_at_cand_rank), "rank_val": cand_r_val})
-                except ValueError:
-                    continue  # Skip if not a valid integer
-
-    if parent_candidates:
-        # The first one found (due to ALL_RANK_ENUMS_SORTED_ASC) will be the closest parent
-        true_parent_id = parent_candidates[0]["id"]
-        true_parent_rank_level = parent_candidates[0]["rank_val"]
-
-    # Major Parent: Smallest major_rank_value > current_rank_val that has a non-null taxon_id
-    major_parent_candidates = []
-    for major_r_val in sorted(list(MAJOR_RANK_VALUES)):  # Iterate major ranks from lowest value up
-        if major_r_val > current_rank_val:  # Parent major rank value must be larger
-            prefix = f"L{major_r_val}"  # Major ranks use L{val} format in TSV (e.g., L10, L20)
-            tid_at_major_rank = row_dict.get(f"{prefix}_taxonID")
-            if tid_at_major_rank is not None and str(tid_at_major_rank).strip() not in ["", "NULL"]:
-                try:
-                    major_parent_candidates.append(
-                        {"id": int(tid_at_major_rank), "rank_val": major_r_val}
-                    )
-                except ValueError:
-                    continue
-
-    if major_parent_candidates:
-        # The first one found will be the closest major parent
-        major_parent_id = major_parent_candidates[0]["id"]
-        major_parent_rank_level = major_parent_candidates[0]["rank_val"]
-
-    return true_parent_id, true_parent_rank_level, major_parent_id, major_parent_rank_level
-
-
-def get_immediate_ancestor_info(
-    row_dict: dict,
-) -> tuple[int | None, int | None]:
+def parse_int_column(col: pl.Series, *, strict: bool = False) -> pl.Series:
     """
-    Calculates immediateAncestor_taxonID and immediateAncestor_rankLevel.
-    This is equivalent to what was called "true parent" previously.
+    Cast a text id column (NULL/empty already mapped to null) to Int64.
+
+    Exporters do not pad values, so the plain cast is the fast path; the column is only
+    re-parsed through ``strip_chars`` when that cast rejected something non-null.
     """
-    current_rank_val = int(row_dict["rankLevel"])
-    ancestor_id: int | None = None
-    ancestor_rank_level: int | None = None
-
-    # Find the closest ancestor: Smallest rank_value > current_rank_val that has a non-null taxon_id
-    parent_candidates = []
-    for r_enum_cand in ALL_RANK_ENUMS_SORTED_ASC:  # Iterate from lowest rank value up
-        cand_r_val = r_enum_cand.value
-        if cand_r_val > current_rank_val:  # Parent rank value must be larger
-            db_col_val_str = str(cand_r_val)
-            if cand_r_val == 335:
-                prefix = "L33_5"
-            elif cand_r_val == 345:
-                prefix = "L34_5"
-            else:
-                prefix = f"L{db_col_val_str}"
-
-            tid_at_cand_rank = row_dict.get(f"{prefix}_taxonID")
-            if tid_at_cand_rank is not None and str(tid_at_cand_rank).strip() not in ["", "NULL"]:
-                try:
-                    parent_candidates.append({"id": int(tid_at_cand_rank), "rank_val": cand_r_val})
-                except ValueError:
-                    continue
-
-    if parent_candidates:
-        ancestor_id = parent_candidates[0]["id"]
-        ancestor_rank_level = parent_candidates[0]["rank_val"]
-
-    return ancestor_id, ancestor_rank_level
-
-
-def get_immediate_major_ancestor_info(
-    row_dict: dict,
-) -> tuple[int | None, int | None]:
+    ints = col.cast(pl.Int64, strict=False)
+    if ints.null_count() > col.null_count():
+        ints = col.str.strip_chars().cast(pl.Int64, strict=strict)
+    return ints
+
+
+def ancestor_exprs(columns: list[str]) -> list[pl.Expr]:
     """
-    Calculates immediateMajorAncestor_taxonID and immediateMajorAncestor_rankLevel.
-    This is equivalent to what was called "major parent" previously.
+    Vectorised immediateAncestor_* / immediateMajorAncestor_* over the L{X}_taxonID columns.
+
+    A single ascending walk over the ranks builds one ``when(rankLevel < rank)`` branch per
+    populated rank column and feeds it to both the immediate and (for major ranks) the
+    immediate-major coalesce, so the smallest rank above the row's own rank with a non-null
+    taxon id wins, i.e. what the old per-row scans returned.
     """
-    current_rank_val = int(row_dict["rankLevel"])
-    major_ancestor_id: int | None = None
-    major_ancestor_rank_level: int | None = None
-
-    # Find the closest major ancestor: Smallest major_rank_value > current_rank_val that has a non-null taxon_id
-    major_parent_candidates = []
-    for major_r_val in sorted(list(MAJOR_RANK_VALUES)):  # Iterate major ranks from lowest value up
-        if major_r_val > current_rank_val:  # Parent major rank value must be larger
-            prefix = f"L{major_r_val}"
-            tid_at_major_rank = row_dict.get(f"{prefix}_taxonID")
-            if tid_at_major_rank is not None and str(tid_at_major_rank).strip() not in ["", "NULL"]:
-                try:
-                    major_parent_candidates.append(
-                        {"id": int(tid_at_major_rank), "rank_val": major_r_val}
-                    )
-                except ValueError:
-                    continue
-
-    if major_parent_candidates:
-        major_ancestor_id = major_parent_candidates[0]["id"]
-        major_ancestor_rank_level = major_parent_candidates[0]["rank_val"]
-
-    return major_ancestor_id, major_ancestor_rank_level
+    ia_id: list[pl.Expr] = []
+    ia_rl: list[pl.Expr] = []
+    ima_id: list[pl.Expr] = []
+    ima_rl: list[pl.Expr] = []
+    for rank_val in ASC_RANK_VALUES:
+        tid_col = TAXONID_COL[rank_val]
+        if tid_col not in columns:
+            continue
+        hit = (pl.col("rankLevel") < rank_val) & pl.col(tid_col).is_not_null()
+        id_branch = pl.when(hit).then(pl.col(tid_col))
+        rank_branch = pl.when(hit).then(pl.lit(rank_val, dtype=pl.Int64))
+        ia_id.append(id_branch)
+        ia_rl.append(rank_branch)
+        if rank_val in MAJOR_RANK_VALUES:
+            ima_id.append(id_branch)
+            ima_rl.append(rank_branch)
+
+    def first_hit(branches: list[pl.Expr], alias: str) -> pl.Expr:
+        if not branches:
+            return pl.lit(None, dtype=pl.Int64).alias(alias)
+        return pl.coalesce(branches).alias(alias)
+
+    return [
+        first_hit(ia_id, "immediateAncestor_taxonID"),
+        first_hit(ia_rl, "immediateAncestor_rankLevel"),
+        first_hit(ima_id, "immediateMajorAncestor_taxonID"),
+        first_hit(ima_rl, "immediateMajorAncestor_rankLevel"),
+    ]
 
 
 # Function get_ancestry_str removed - no longer needed since ancestry column is deprecated
 
 
+def build_expanded_taxa_frame(tsv: Path, final_db_header: list[str]) -> pl.DataFrame:
+    """
+    Read the expanded_taxa TSV and derive every output column in one columnar pass.
+
+    The derivation is CPU-bound but already runs on Polars' native thread pool (sized by
+    ``POLARS_MAX_THREADS``), outside the GIL; only the SQLite writer stays single-threaded.
+    """
+    # scan_csv memory-maps the file and only parses the projected columns; reading
+    # everything as text means the header is known without a schema-inference pass.
+    source = pl.scan_csv(tsv, separator="\t", infer_schema=False, null_values=["", "NULL"])
+    header = source.collect_schema().names()
+    rank_id_cols = [TAXONID_COL[v] for v in ASC_RANK_VALUES if TAXONID_COL[v] in header]
+    # Only project the columns we emit or derive from; the per-rank name/commonName
+    # columns and any stale derived parent/ancestry columns are never materialised.
+    source_cols = [c for c in header if c in final_db_header or c in rank_id_cols]
+    # Cast explicitly below; unparseable ids become NULL like before.
+    frame = source.select(source_cols).collect()
+    frame = frame.with_columns(
+        *(parse_int_column(frame[c]) for c in ["taxonID", *rank_id_cols]),
+        parse_int_column(frame["rankLevel"], strict=True),
+    )
+
+    derived: dict[str, pl.Expr] = {
+        # 1. Populate the base common name (suffix marks it as auto-generated)
+        "commonName": pl.when(pl.col("commonName").is_null() & pl.col("name").is_not_null())
+        .then(pl.col("name") + "_cmn")
+        .otherwise(pl.col("commonName")),
+        # 2. Handle taxonActive boolean
+        "taxonActive": pl.col("taxonActive")
+        .is_in(TAXON_ACTIVE_TRUE)
+        .fill_null(False)
+        .cast(pl.Int64),
+    }
+    # 3. Calculate new parent/ancestor info
+    derived.update({e.meta.output_name(): e for e in ancestor_exprs(rank_id_cols)})
+    # One select in output order: no intermediate frame carrying the rank columns along.
+    # Run it through the lazy engine so common-subexpression elimination evaluates each
+    # rank's ``hit`` mask once and shares it across the four ancestor outputs.
+    return (
+        frame.lazy()
+        .select(derived[c].alias(c) if c in derived else pl.col(c) for c in final_db_header)
+        .collect()
+    )
+
+
 def main() -> None:
     if DB_PATH.exists():
         DB_PATH.unlink()
     conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
+    # Throwaway fixture build: trade durability for bulk-insert throughput.
+    for pragma in FIXTURE_PRAGMAS:
+        conn.execute(pragma)
 
     for tsv in TSV_DIR.glob("*.tsv"):
         print(f"  → importing {tsv.name}")
         if tsv.stem == "expanded_taxa_sample":
-            with tsv.open(newline="") as fh:
-                reader = csv.DictReader(fh, delimiter="\t")
-                reader = csv.DictReader(fh, delimiter="\t")
-
-                # Define new column names
-                new_col_immediate_ancestor_id = "immediateAncestor_taxonID"
-                new_col_immediate_ancestor_rank_level = "immediateAncestor_rankLevel"
-                new_col_immediate_major_ancestor_id = "immediateMajorAncestor_taxonID"
-                new_col_immediate_major_ancestor_rank_level = "immediateMajorAncestor_rankLevel"
-
-                # Remove old parent columns from header if they exist from a previous version of the script/TSV
-                # For this script, we assume the input TSV does *not* have these new columns yet,
-                # but it might have the *old* derived parent columns.
-                # The goal is that the *output SQLite table* has the new columns and *not* the old ones.
-                old_parent_cols = [
-                    "trueParentID",
-                    "trueParentRankLevel",
-                    "majorParentID",
-                    "majorParentRankLevel",
-                    "ancestry",  # Remove ancestry column as well
-                ]
-                final_db_header = [
-                    "taxonID",
-                    "rankLevel",
-                    "rank",
-                    "name",
-                    "taxonActive",
-                    "commonName",
-                    new_col_immediate_ancestor_id,
-                    new_col_immediate_ancestor_rank_level,
-                    new_col_immediate_major_ancestor_id,
-                    new_col_immediate_major_ancestor_rank_level,
-                    # ancestry column removed - no longer generated
-                ]
-
-                table_name = "expanded_taxa" if tsv.stem == "expanded_taxa_sample" else tsv.stem
-                cur.execute(f"DROP TABLE IF EXISTS {q(table_name)};")
-                cols_ddl_parts = []
-                for col_name in final_db_header:
-                    if (
-                        "taxonID" in col_name
-                        or "ParentID" in col_name
-                        or "Ancestor_taxonID" in col_name
-                    ):  # Covers new names
-                        cols_ddl_parts.append(f"{q(col_name)} INTEGER")
-                    elif (
-                        "RankLevel" in col_name
-                        or col_name == "rankLevel"
-                        or "Ancestor_rankLevel" in col_name
-                    ):  # Covers new names
-                        cols_ddl_parts.append(f"{q(col_name)} INTEGER")
-                    elif col_name == "taxonActive":
-                        cols_ddl_parts.append(f"{q(col_name)} INTEGER")  # 0 or 1
-                    else:
-                        cols_ddl_parts.append(f"{q(col_name)} TEXT")
-                cols_ddl = ", ".join(cols_ddl_parts)
-                cur.execute(f"CREATE TABLE {q(table_name)} ({cols_ddl});")
-
-                processed_rows_for_db = []
-                for row_dict in reader:
-                    # Make a copy to add new computed values for DB insertion
-                    db_row_dict = dict(row_dict)
-
-                    # 1. Populate common names (base and ancestral) - if not already present
-                    if not db_row_dict.get("commonName") and db_row_dict.get("name"):
-                        db_row_dict["commonName"] = (
-                            db_row_dict["name"] + "_cmn"
-                        )  # Suffix for auto-generated
-
-                    for r_enum in RankLevel:
-                        val_str = str(r_enum.value)
-                        if r_enum.value == 335:
-                            pfix = "L33_5"
-                        elif r_enum.value == 345:
-                            pfix = "L34_5"
-                        else:
-                            pfix = f"L{val_str}"
-
-                        common_col = f"{pfix}_commonName"
-                        name_col = f"{pfix}_name"
-                        if not db_row_dict.get(common_col) and db_row_dict.get(name_col):
-                            db_row_dict[common_col] = db_row_dict[name_col] + "_cmn"
-
-                    # 2. Calculate new parent/ancestor info
-                    ia_id, ia_rl = get_immediate_ancestor_info(
-                        row_dict
-                    )  # Use original row_dict from TSV
-                    ima_id, ima_rl = get_immediate_major_ancestor_info(row_dict)
-
-                    db_row_dict[new_col_immediate_ancestor_id] = ia_id
-                    db_row_dict[new_col_immediate_ancestor_rank_level] = ia_rl
-                    db_row_dict[new_col_immediate_major_ancestor_id] = ima_id
-                    db_row_dict[new_col_immediate_major_ancestor_rank_level] = ima_rl
-
-                    # 3. ancestry column removed - no longer generated
-
-                    # 4. Handle taxonActive boolean
-                    if "taxonActive" in db_row_dict:  # Check in db_row_dict
-                        db_row_dict["taxonActive"] = (
-                            1 if str(db_row_dict["taxonActive"]).lower() == "t" else 0
-                        )
-
-                    # Remove old parent columns from the final dict to be inserted into DB
-                    for old_col in old_parent_cols:
-                        db_row_dict.pop(old_col, None)
-
-                    processed_rows_for_db.append([db_row_dict.get(col) for col in final_db_header])
-
-                placeholders = ", ".join("?" for _ in final_db_header)
-                insert_sql = f"INSERT INTO {q(table_name)} ({', '.join(map(q, final_db_header))}) VALUES ({placeholders});"
-                cur.executemany(insert_sql, processed_rows_for_db)
+            table_name = "expanded_taxa"
+            col_types = SCHEMA_HINTS[table_name]
+            final_db_header = list(col_types)
+            create_table(conn, table_name, col_types)
+
+            frame = build_expanded_taxa_frame(tsv, final_db_header)
+            insert_sql = insert_statement(table_name, final_db_header)
+            conn.execute("BEGIN")
+            for batch in frame.iter_slices(n_rows=INSERT_BATCH_ROWS):
+                conn.executemany(insert_sql, batch.rows())
+            conn.commit()
+            # Index after the bulk insert, with the loader's index set and names.
+            for ddl in EXPANDED_TAXA_INDEXES:
+                conn.execute(ddl)
         else:  # For other TSV files like coldp_*, load them as simple tables
-            load_table(cur, tsv.stem, tsv)
+            load_table(conn, tsv.stem, tsv)
 
+    # Planner statistics for the freshly built indexes
+    conn.execute("ANALYZE")
     conn.commit()
     conn.close()
     print("Fixture DB regenerated →", DB_PATH)
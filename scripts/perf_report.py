@@ -1,20 +1,29 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import math
 import os
+import platform
+import sqlite3
 import statistics
 import time
-from dataclasses import dataclass
+from array import array
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from typus.services import (
     PostgresTaxonomyService,
     SQLiteTaxonomyService,
     load_expanded_taxa,
 )
+from typus.services.pg_index_helper import DDL_PATTERN, DDL_TRGM, index_name_from_ddl
 from typus.services.pg_test_ops import resolve_test_dsn
+from typus.services.taxonomy.common import prefix_upper_bound
 
 
 @dataclass
@@ -28,12 +37,36 @@ class Result:
     n: int
     count_avg: float
     span_pct: float | None = None
+    # "serial": one request in flight; "concurrent": BENCH_CONCURRENCY in flight
+    load: str = "serial"
+    # Warm-up iterations run before sampling, and how much slower the first one was
+    # than the settled trailing window
+    warmup_n: int = 0
+    cold_penalty_ms: float = 0.0
+    cv: float = 0.0
+
+
+_TRUTHY = {"1", "true", "TRUE"}
+# Harness switches, read once at import rather than per sample
+VERIFY = os.getenv("TYPUS_PERF_VERIFY", "0") in _TRUTHY
+WRITE = os.getenv("TYPUS_PERF_WRITE", "1") in _TRUTHY
+EXPLAIN = os.getenv("TYPUS_PERF_EXPLAIN", "0") in _TRUTHY
+
+# In-flight requests for the concurrent rows (roughly a connection pool's worth)
+BENCH_CONCURRENCY = int(os.getenv("TYPUS_PERF_CONCURRENCY", "10"))
+# Measured samples per serial probe once warm-up has settled
+SAMPLES_PER_PROBE = 20
+# Trailing window for the warm-up CV check and the cold-start penalty
+WARMUP_WINDOW = 5
+# Flag a row [VAR] when its samples' coefficient of variation exceeds this
+VAR_CV = 0.25
 
 
 async def _bench_once(
     svc, query: str, scope: str, mode: str, fuzzy: bool
-) -> tuple[float, int, list[int]]:
-    t0 = time.perf_counter()
+) -> tuple[int, int, list[int]]:
+    """Time one search; elapsed is integer nanoseconds."""
+    t0 = time.perf_counter_ns()
     res = await svc.search_taxa(
         query,
         scopes={scope},
@@ -42,43 +75,168 @@ async def _bench_once(
         threshold=0.8,
         limit=50,
     )
-    ms = (time.perf_counter() - t0) * 1000.0
-    try:
-        ids = [getattr(t, "taxon_id", None) for t in res]
-    except Exception:
-        ids = []
-    return ms, len(res) if isinstance(res, list) else 0, [i for i in ids if isinstance(i, int)]
+    ns = time.perf_counter_ns() - t0
+    ids = [t.taxon_id for t in res if hasattr(t, "taxon_id")]
+    return ns, len(res) if isinstance(res, list) else 0, ids
+
+
+async def _timed(
+    sem: asyncio.Semaphore, svc, query: str, scope: str, mode: str, fuzzy: bool
+) -> tuple[int, int, list[int]]:
+    async with sem:
+        return await _bench_once(svc, query, scope, mode, fuzzy)
+
+
+async def _warmup(
+    svc,
+    query: str,
+    scope: str,
+    mode: str,
+    fuzzy: bool,
+    *,
+    w: int = WARMUP_WINDOW,
+    tau: float = 0.05,
+    n_min: int = 3,
+    n_max: int = 30,
+) -> list[int]:
+    """Run the probe until it settles and return the warm-up timings (ns).
+
+    Stops once the trailing ``w`` runtimes have a coefficient of variation below
+    ``tau`` (after at least ``max(n_min, w)`` runs), or after ``n_max`` runs. Cheap,
+    hot probes settle after a handful; cold plan caches keep going.
+    """
+    timings: list[int] = []
+    while len(timings) < n_max:
+        ns, _count, _ids = await _bench_once(svc, query, scope, mode, fuzzy)
+        timings.append(ns)
+        if len(timings) >= max(n_min, w) and _cv(timings[-w:]) < tau:
+            break
+    return timings
+
+
+def _cv(samples: Sequence[int]) -> float:
+    avg = statistics.mean(samples)
+    return statistics.stdev(samples) / avg if len(samples) > 1 and avg > 0 else 0.0
+
+
+def _summarise(
+    backend: str,
+    scope: str,
+    mode: str,
+    fuzzy: bool,
+    samples: Sequence[int],
+    counts: Sequence[int],
+    *,
+    load: str,
+) -> Result:
+    """Aggregate nanosecond samples into a millisecond ``Result`` row."""
+    n = len(samples)
+    avg = sum(samples) / n
+    # Nearest-rank p95: one sort, no interpolation
+    p95 = sorted(samples)[math.ceil(0.95 * n) - 1]
+    span = (max(samples) - min(samples)) / avg if avg > 0 else 0.0
+    cnt_avg = sum(counts) / len(counts) if counts else 0.0
+    return Result(
+        backend,
+        scope,
+        mode,
+        fuzzy,
+        avg / 1e6,
+        p95 / 1e6,
+        n,
+        cnt_avg,
+        span,
+        load,
+        cv=_cv(samples),
+    )
 
 
-def _verify(query: str, scope: str, mode: str, ids: list[int], *, backend: str) -> None:
-    if os.getenv("TYPUS_PERF_VERIFY", "0") not in {"1", "true", "TRUE"}:
-        return
+def _verify(q_lower: str, scope: str, mode: str, ids: list[int], *, backend: str) -> None:
+    """Sanity-check one sample; ``q_lower`` is the query already lowercased."""
     # Minimal sanity checks against the shared fixture semantics
     # - scientific/prefix "Apis" contains genus 47220
     # - vernacular/exact "honey bee" contains species 47219
-    if scope == "scientific" and mode in {"exact"} and query.lower() == "apis mellifera":
+    if scope == "scientific" and mode == "exact" and q_lower == "apis mellifera":
         assert 47219 in ids, "Expected species Apis mellifera (47219) to be present"
-    if scope == "scientific" and mode == "prefix" and query.lower().startswith("apis"):
+    if scope == "scientific" and mode == "prefix" and q_lower.startswith("apis"):
         if backend == "sqlite":
             # Small fixture should include genus Apis in top-k
             assert 47220 in ids, "Expected genus Apis (47220) to be present in sqlite fixture"
         else:
             # Large PG datasets may return many species first; require non-empty
             assert len(ids) > 0, "Expected non-empty results for scientific prefix 'Apis'"
-    if scope == "vernacular" and mode == "exact" and query.lower() == "honey bee":
+    if scope == "vernacular" and mode == "exact" and q_lower == "honey bee":
         assert 47219 in ids, "Expected species Apis mellifera (47219) to be present"
 
 
-async def _bench_backend(backend: str) -> list[Result]:
+def _pg_engine(dsn: str) -> AsyncEngine:
+    """One pooled engine for the whole run, shared by the matrix and the EXPLAIN snippets.
+
+    Sized for the concurrent rows; JIT is off per session so sub-ms probes do not pay
+    JIT compilation.
+    """
+    return create_async_engine(
+        dsn,
+        pool_pre_ping=True,
+        pool_size=BENCH_CONCURRENCY,
+        max_overflow=0,
+        connect_args={"server_settings": {"jit": "off"}},
+    )
+
+
+async def _pg_prewarm(eng: AsyncEngine) -> None:
+    """Open the pool's connections up front so no timed sample pays connect + introspection."""
+    conns = await asyncio.gather(*(eng.connect() for _ in range(BENCH_CONCURRENCY)))
+    for conn in conns:
+        await conn.close()
+
+
+async def _pg_ensure_name_indexes(eng: AsyncEngine) -> None:
+    """Check the LOWER(..) expression indexes the name-search matrix relies on.
+
+    The text_pattern_ops indexes serve prefix probes (PG seq-scans them otherwise under
+    a non-C collation); the pg_trgm GIN indexes serve substring probes, which would
+    otherwise recompute ``lower(name)`` for every heap row. The DDL only runs with
+    ``TYPUS_ALLOW_DDL`` set; otherwise missing indexes are reported.
+    """
+    ddls = [*DDL_PATTERN, *DDL_TRGM]
+    if os.getenv("TYPUS_ALLOW_DDL"):
+        try:
+            async with eng.begin() as conn:
+                await conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except Exception as e:  # may need superuser; the trigram DDL then fails below
+            print(f"WARNING: could not create extension pg_trgm: {e}")
+        for ddl in ddls:
+            try:
+                async with eng.begin() as conn:
+                    await conn.exec_driver_sql(ddl.format(fqtn="expanded_taxa"))
+            except Exception as e:  # trigram DDL needs the pg_trgm extension
+                print(f"WARNING: could not create {index_name_from_ddl(ddl)}: {e}")
+    async with eng.connect() as conn:
+        res = await conn.exec_driver_sql(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'expanded_taxa'"
+        )
+        present = {r[0] for r in res}
+    missing = [name for name in map(index_name_from_ddl, ddls) if name not in present]
+    if missing:
+        print(
+            "WARNING: missing PG name indexes "
+            + ", ".join(missing)
+            + " (run typus-pg-ensure-indexes or set TYPUS_ALLOW_DDL=1)"
+        )
+
+
+async def _bench_backend(backend: str, pg_engine: AsyncEngine | None = None) -> list[Result]:
     # Ensure SQLite DB present
     if backend == "sqlite":
         db = load_expanded_taxa(Path(".cache/typus/expanded_taxa.sqlite"))
         svc = SQLiteTaxonomyService(db)
     else:
-        dsn = resolve_test_dsn()
-        if not dsn:
+        if pg_engine is None:
             return []
-        svc = PostgresTaxonomyService(dsn)
+        await _pg_ensure_name_indexes(pg_engine)
+        await _pg_prewarm(pg_engine)
+        svc = PostgresTaxonomyService(pg_engine)
 
     # Query matrix
     matrix = [
@@ -92,107 +250,190 @@ async def _bench_backend(backend: str) -> list[Result]:
 
     out: list[Result] = []
     for q, scope in matrix:
+        q_lower = q.lower()
         for mode in modes:
             for fuzzy in fuzzies:
-                samples: list[float] = []
-                counts: list[int] = []
-                # warm-up + samples
-                for i in range(6):
-                    ms, count, ids = await _bench_once(svc, q, scope, mode, fuzzy)
-                    if i >= 1:
-                        _verify(q, scope, mode, ids, backend=backend)
-                    if i >= 1:
-                        samples.append(ms)
-                        counts.append(count)
-                if samples:
-                    avg = statistics.mean(samples)
-                    p95 = (
-                        statistics.quantiles(samples, n=20)[18]
-                        if len(samples) >= 20
-                        else max(samples)
-                    )
-                    span = (max(samples) - min(samples)) / avg if avg > 0 else 0.0
-                    cnt_avg = statistics.mean(counts) if counts else 0.0
-                    out.append(
-                        Result(backend, scope, mode, fuzzy, avg, p95, len(samples), cnt_avg, span)
+                warm = await _warmup(svc, q, scope, mode, fuzzy)
+                samples = array("q", bytes(8 * SAMPLES_PER_PROBE))
+                counts = array("q", bytes(8 * SAMPLES_PER_PROBE))
+                for i in range(SAMPLES_PER_PROBE):
+                    ns, count, ids = await _bench_once(svc, q, scope, mode, fuzzy)
+                    if VERIFY:
+                        _verify(q_lower, scope, mode, ids, backend=backend)
+                    samples[i] = ns
+                    counts[i] = count
+                res = _summarise(backend, scope, mode, fuzzy, samples, counts, load="serial")
+                res.warmup_n = len(warm)
+                res.cold_penalty_ms = (warm[0] - statistics.mean(warm[-WARMUP_WINDOW:])) / 1e6
+                out.append(res)
+                # Same probe with BENCH_CONCURRENCY requests in flight: per-request latency
+                # under load, and the whole block finishes in ~1/BENCH_CONCURRENCY the time.
+                sem = asyncio.Semaphore(BENCH_CONCURRENCY)
+                tasks = [
+                    asyncio.create_task(_timed(sem, svc, q, scope, mode, fuzzy))
+                    for _ in range(BENCH_CONCURRENCY)
+                ]
+                timed = await asyncio.gather(*tasks)
+                out.append(
+                    _summarise(
+                        backend,
+                        scope,
+                        mode,
+                        fuzzy,
+                        [ns for ns, _c, _ids in timed],
+                        [c for _ns, c, _ids in timed],
+                        load="concurrent",
                     )
+                )
     return out
 
 
-def _write_report(results: list[Result]) -> None:
-    path = Path("dev/agents/perf_report.md")
-    lines: list[str] = []
-    lines.append("---")
-    lines.append("doc_type: docs_page")
-    lines.append("title: Typus v0.4.0 – Name Search Perf Baseline")
-    lines.append("created: 2025-09-08T00:00:00Z")
-    lines.append("updated: 2025-09-08T00:00:00Z")
-    lines.append("tags: [perf, search, sqlite, postgres]")
-    lines.append("---\n")
-    lines.append("# Summary\n")
-    lines.append("Timings in milliseconds (avg over 5 samples after warm-up). Lower is better.\n")
-    # Table header
-    lines.append("backend | scope | mode | fuzzy | avg_ms | p95_ms | n | count_avg | span_pct")
-    lines.append("---|---|---|---|---:|---:|--:|--:|--:")
-    for r in results:
-        span_pct = (r.span_pct or 0.0) * 100.0
-        lines.append(
-            f"{r.backend} | {r.scope} | {r.mode} | {str(r.fuzzy).lower()} | {r.ms_avg:.2f} | {r.ms_p95:.2f} | {r.n} | {r.count_avg:.1f} | {span_pct:.1f}%"
+REPORT_PATH = Path("dev/agents/perf_report.md")
+REPORT_JSON_PATH = REPORT_PATH.with_suffix(".json")
+
+REPORT_HEADER = """---
+doc_type: docs_page
+title: Typus v0.4.0 – Name Search Perf Baseline
+created: 2025-09-08T00:00:00Z
+updated: 2025-09-08T00:00:00Z
+tags: [perf, search, sqlite, postgres]
+---
+
+# Summary
+
+Timings in milliseconds (avg over {samples} samples after an adaptive warm-up that runs until the trailing CV drops below 5%). Lower is better.
+
+`serial` rows run one request at a time; `concurrent` rows keep {concurrency} in flight.
+
+{environment}
+
+backend | scope | mode | fuzzy | load | avg_ms | p95_ms | n | count_avg | span_pct | warmup_n | cold_ms
+---|---|---|---|---|---:|---:|--:|--:|--:|--:|--:
+"""
+ROW_TEMPLATE = (
+    "{backend} | {scope} | {mode} | {fuzzy} | {load} | {ms_avg:.2f} | {ms_p95:.2f} | {n}"
+    " | {count_avg:.1f} | {span_pct:.1f}% | {warmup_n} | {cold_penalty_ms:.2f}\n"
+)
+
+
+async def _environment(pg_engine: AsyncEngine | None) -> dict[str, str]:
+    """Host and engine versions, recorded so runs can be compared like for like."""
+    env = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": platform.processor() or platform.machine(),
+        "cpu_count": str(os.cpu_count()),
+        "sqlite": sqlite3.sqlite_version,
+    }
+    if pg_engine is not None:
+        try:
+            async with pg_engine.connect() as conn:
+                res = await conn.exec_driver_sql("SHOW server_version")
+                env["postgres"] = str(res.scalar())
+        except Exception as e:
+            env["postgres"] = f"unavailable ({e})"
+    return env
+
+
+def _write_report(results: list[Result], env: dict[str, str]) -> None:
+    env_md = "\n".join(f"- {k}: {v}" for k, v in env.items())
+    with REPORT_PATH.open("w", buffering=1 << 16) as fh:
+        fh.write(
+            REPORT_HEADER.format(
+                samples=SAMPLES_PER_PROBE, concurrency=BENCH_CONCURRENCY, environment=env_md
+            )
         )
-    lines.append("")
-    path.write_text("\n".join(lines))
+        for r in results:
+            row = vars(r) | {
+                "fuzzy": str(r.fuzzy).lower(),
+                "span_pct": (r.span_pct or 0.0) * 100.0,
+            }
+            fh.write(ROW_TEMPLATE.format_map(row))
+    # Machine-readable twin so CI can diff numbers without parsing markdown
+    REPORT_JSON_PATH.write_text(
+        json.dumps({"environment": env, "results": [asdict(r) for r in results]}, indent=2)
+    )
 
 
-async def _pg_explain_snippets() -> list[str]:
-    dsn = resolve_test_dsn()
-    if not dsn or os.getenv("TYPUS_PERF_EXPLAIN", "0") not in {"1", "true", "TRUE"}:
+async def _pg_explain_snippets(eng: AsyncEngine | None) -> list[str]:
+    if eng is None or not EXPLAIN:
         return []
-    eng = create_async_engine(dsn, pool_pre_ping=True)
-    queries = [
+    major = '"rankLevel" IN (10,20,30,40,50,60,70)'
+    order = 'ORDER BY "rankLevel", name LIMIT 50'
+    # Prefix probes use starts_with() rather than LIKE 'x%' so the plan does not hinge
+    # on the planner's LIKE rewrite; the range form A/Bs the same text_pattern_ops index.
+    queries: list[tuple[str, str, dict[str, str]]] = [
         (
             "scientific prefix",
-            'SELECT taxonID FROM expanded_taxa WHERE LOWER(name) LIKE \'apis me%\' AND "rankLevel" IN (10,20,30,40,50,60,70) ORDER BY "rankLevel", name LIMIT 50',
+            f'SELECT "taxonID" FROM expanded_taxa WHERE starts_with(LOWER(name), :p) AND {major} {order}',
+            {"p": "apis me"},
+        ),
+        (
+            "scientific prefix (range)",
+            f'SELECT "taxonID" FROM expanded_taxa WHERE LOWER(name) ~>=~ :lo AND LOWER(name) ~<~ :hi AND {major} {order}',
+            {"lo": "apis me", "hi": prefix_upper_bound("apis me")},
         ),
         (
             "scientific substring",
-            "SELECT taxonID FROM expanded_taxa WHERE LOWER(name) LIKE '%apis me%' ORDER BY \"rankLevel\", name LIMIT 50",
+            f'SELECT "taxonID" FROM expanded_taxa WHERE LOWER(name) LIKE :p {order}',
+            {"p": "%apis me%"},
+        ),
+        (
+            "vernacular prefix",
+            f'SELECT "taxonID" FROM expanded_taxa WHERE starts_with(LOWER("commonName"), :p) {order}',
+            {"p": "honey bee"},
+        ),
+        (
+            "vernacular substring",
+            f'SELECT "taxonID" FROM expanded_taxa WHERE LOWER("commonName") LIKE :p {order}',
+            {"p": "%honey bee%"},
         ),
     ]
     out: list[str] = []
     async with eng.begin() as conn:
-        for label, q in queries:
+        for label, q, params in queries:
             try:
-                res = await conn.exec_driver_sql(
-                    f"EXPLAIN (ANALYZE, BUFFERS, COSTS OFF, TIMING OFF) {q}"
+                res = await conn.execute(
+                    text(f"EXPLAIN (ANALYZE, BUFFERS, COSTS OFF, TIMING OFF) {q}"), params
                 )
                 plan = "\n".join(r[0] for r in res)
                 out.append(f"### PG EXPLAIN – {label}\n\n```\n{plan}\n```\n")
             except Exception as e:
                 out.append(f"### PG EXPLAIN – {label} (error)\n\n{e}\n")
-    await eng.dispose()
     return out
 
 
 async def main() -> int:
+    dsn = resolve_test_dsn()
+    pg_engine = _pg_engine(dsn) if dsn else None
+    try:
+        return await _run(pg_engine)
+    finally:
+        if pg_engine is not None:
+            await pg_engine.dispose()
+
+
+async def _run(pg_engine: AsyncEngine | None) -> int:
     res_sqlite = await _bench_backend("sqlite")
-    res_pg = await _bench_backend("postgres")
+    res_pg = await _bench_backend("postgres", pg_engine)
     results = res_sqlite + res_pg
     for r in results:
         span_pct = (r.span_pct or 0.0) * 100.0
-        warn = " [VAR]" if (r.span_pct or 0.0) > 0.25 else ""
+        warn = " [VAR]" if r.cv > VAR_CV else ""
         print(
-            f"{r.backend}/{r.scope}/{r.mode}/fuzzy={r.fuzzy} -> avg={r.ms_avg:.2f} ms p95={r.ms_p95:.2f} ms (n={r.n}, count~{r.count_avg:.1f}, span={span_pct:.1f}%)"
+            f"{r.backend}/{r.scope}/{r.mode}/fuzzy={r.fuzzy}/{r.load} -> avg={r.ms_avg:.2f} ms p95={r.ms_p95:.2f} ms (n={r.n}, count~{r.count_avg:.1f}, span={span_pct:.1f}%, warmup={r.warmup_n}, cold=+{r.cold_penalty_ms:.2f} ms)"
             + warn
         )
-    if os.getenv("TYPUS_PERF_WRITE", "1") in {"1", "true", "TRUE"}:
-        _write_report(results)
+    env = await _environment(pg_engine)
+    print("environment: " + ", ".join(f"{k}={v}" for k, v in env.items()))
+    if WRITE:
+        _write_report(results, env)
         # Append PG explain snippets if requested
-        snippets = await _pg_explain_snippets()
+        snippets = await _pg_explain_snippets(pg_engine)
         if snippets:
-            path = Path("dev/agents/perf_report.md")
-            with path.open("a") as fh:
+            with REPORT_PATH.open("a") as fh:
                 fh.write("\n\n" + "\n\n".join(snippets))
-        print("perf report written to dev/agents/perf_report.md")
+        print(f"perf report written to {REPORT_PATH} (+ {REPORT_JSON_PATH.name})")
     return 0
 
 
@@ -1,24 +1,59 @@
+import hashlib
+import os
 from pathlib import Path
 from typing import AsyncGenerator
 
+import pytest
 import pytest_asyncio
 
-from typus.services import SQLiteTaxonomyService
+from typus.services import SQLiteTaxonomyService, sqlite_loader
 from typus.services.sqlite_loader import load_expanded_taxa
 from typus.services.taxonomy import AbstractTaxonomyService
 
+SAMPLE_TSV = Path("tests/sample_tsv/expanded_taxa_sample.tsv")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip ``network`` tests unless ``TYPUS_NETWORK_TESTS`` is enabled."""
+    if os.getenv("TYPUS_NETWORK_TESTS", "0") in {"1", "true", "TRUE"}:
+        return
+    skip = pytest.mark.skip(reason="network checks disabled by default")
+    for item in items:
+        if item.get_closest_marker("network") is not None:
+            item.add_marker(skip)
+
+
+def _fixture_db(request, tmp_path_factory) -> Path:
+    """Build the sample SQLite DB once per TSV content, reused across pytest runs.
+
+    The file lives in pytest's cache dir keyed by a hash of the TSV (override the TSV
+    with ``TYPUS_TEST_TSV``) and of the loader source, so it is rebuilt only when
+    either changes.
+    """
+    tsv = Path(os.getenv("TYPUS_TEST_TSV", SAMPLE_TSV))
+    h = hashlib.sha256(tsv.read_bytes())
+    h.update(Path(sqlite_loader.__file__).read_bytes())
+    digest = h.hexdigest()[:16]
+    cache = request.config.cache
+    cache_dir = (
+        cache.mkdir("typus-sqlite") if cache is not None else tmp_path_factory.mktemp("sqlite")
+    )
+    db_path = cache_dir / f"expanded_taxa-{digest}.sqlite"
+    if not db_path.exists():
+        # Build beside the target and rename, so a half-built file is never reused
+        partial = cache_dir / f"{db_path.name}.{os.getpid()}.partial"
+        partial.unlink(missing_ok=True)
+        load_expanded_taxa(partial, tsv_path=tsv, force_self_consistent=True)
+        partial.replace(db_path)
+    return db_path
+
 
 @pytest_asyncio.fixture(scope="session")
-async def taxonomy_service(tmp_path_factory) -> AsyncGenerator[AbstractTaxonomyService, None]:
+async def taxonomy_service(
+    request, tmp_path_factory
+) -> AsyncGenerator[AbstractTaxonomyService, None]:
     """Return SQLite service built from the sample TSV fixture."""
-    tmp_dir = tmp_path_factory.mktemp("sqlite_fixture")
-    db_path = tmp_dir / "expanded_taxa.sqlite"
-    load_expanded_taxa(
-        db_path,
-        tsv_path=Path("tests/sample_tsv/expanded_taxa_sample.tsv"),
-        force_self_consistent=True,
-    )
-    service = SQLiteTaxonomyService(db_path)
+    service = SQLiteTaxonomyService(_fixture_db(request, tmp_path_factory))
     try:
         yield service
     finally:
@@ -1,12 +1,16 @@
 import math
 
+import pytest
+
 from typus.models.geometry import BBoxXYWHNorm, to_xyxy_px
 from typus.ops import (
     area_xyxy,
     clamp_xyxy,
     from_xywh_px,
     intersect_xyxy,
+    iou_matrix,
     iou_xyxy,
+    iou_xyxy_batch,
     to_xywh_px,
     xywh_to_xyxy,
     xyxy_to_xywh,
@@ -88,3 +92,15 @@ def test_xywh_px_roundtrip_and_consistency():
     xyxy_direct = to_xyxy_px(b, W, H)
     xyxy_via_rt = to_xyxy_px(b_rt, W, H)
     assert xyxy_direct == xyxy_via_rt
+
+
+def test_iou_batch_and_matrix_match_scalar():
+    a = [(0.0, 0.0, 10.0, 10.0), (5.0, 5.0, 15.0, 15.0), (2.0, 2.0, 8.0, 8.0)]
+    b = [(20.0, 20.0, 30.0, 30.0), (10.0, 0.0, 20.0, 10.0), (5.0, 5.0, 15.0, 15.0)]
+
+    assert iou_xyxy_batch(a, b) == [iou_xyxy(x, y) for x, y in zip(a, b)]
+    assert iou_matrix(a, b) == [[iou_xyxy(x, y) for y in b] for x in a]
+    assert iou_matrix(a, []) == [[], [], []]
+
+    with pytest.raises(ValueError):
+        iou_xyxy_batch(a, b[:2])
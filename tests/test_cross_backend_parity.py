@@ -1,14 +1,14 @@
-import sqlite3
+import asyncio
 from dataclasses import dataclass
-from pathlib import Path
 from typing import List
 
 import pytest
-from sqlalchemy.ext.asyncio import create_async_engine
+import pytest_asyncio
 
 from tests.helpers import taxon_ids
 from tests.pg_test_utils import is_database_unavailable_error, resolve_test_dsn
-from typus.services import PostgresTaxonomyService, SQLiteTaxonomyService, load_expanded_taxa
+from typus.services import PostgresTaxonomyService, SQLiteTaxonomyService
+from typus.services.taxonomy import AbstractTaxonomyService
 
 
 @dataclass
@@ -29,81 +29,72 @@ CASES: List[QueryCase] = [
     QueryCase("mellif", "scientific", "substring"),
 ]
 
+# Resolved at import so the Postgres test is skipped at collection without a DSN
+PG_DSN = resolve_test_dsn()
 
-def sqlite_fixture_count() -> int:
-    db = Path("tests/expanded_taxa_sample.sqlite")
-    conn = sqlite3.connect(db)
-    try:
-        return conn.execute("SELECT COUNT(*) FROM expanded_taxa").fetchone()[0]
-    finally:
-        conn.close()
 
+@pytest.fixture(scope="session")
+def sqlite_count(taxonomy_service: SQLiteTaxonomyService) -> int:
+    """Row count of the shared SQLite fixture, read once per session."""
+    return taxonomy_service._conn.execute("SELECT COUNT(*) FROM expanded_taxa").fetchone()[0]
 
-async def pg_table_count(dsn: str) -> int:
-    eng = create_async_engine(dsn, pool_pre_ping=True)
-    try:
-        async with eng.begin() as conn:
+
+# Postgres row count per DSN, so repeated runs in one session skip the COUNT(*)
+_pg_count_cache: dict[str, int] = {}
+
+
+async def pg_table_count(svc: PostgresTaxonomyService, dsn: str) -> int:
+    """Count on the service's own engine instead of opening (and disposing) another."""
+    if dsn not in _pg_count_cache:
+        async with svc._engine.connect() as conn:
             r = await conn.exec_driver_sql("SELECT COUNT(*) FROM expanded_taxa")
-            return r.scalar() or 0
-    finally:
-        await eng.dispose()
+            _pg_count_cache[dsn] = r.scalar() or 0
+    return _pg_count_cache[dsn]
 
 
-@pytest.mark.asyncio
-@pytest.mark.pg_optional
-async def test_cross_backend_parity_seeded_queries():
-    # Baseline from SQLite fixture (truths)
-    sqlite_db = Path("tests/expanded_taxa_sample.sqlite")
-    if not sqlite_db.exists():
-        # Build from TSV fixture on-demand
-        tsv = Path("tests/sample_tsv/expanded_taxa_sample.tsv")
-        load_expanded_taxa(sqlite_db, tsv_path=tsv, force_self_consistent=True)
-    sql_svc = SQLiteTaxonomyService(sqlite_db)
-
-    baseline: dict[tuple[str, str, str], list[int]] = {}
-    for c in CASES:
-        res = await sql_svc.search_taxa(
-            c.query,
-            scopes={c.scope},
-            match=c.match,
-            fuzzy=False,
-            limit=100,
+async def search_cases(svc: AbstractTaxonomyService) -> list[list[int]]:
+    """Run every case concurrently; ids per case, in ``CASES`` order."""
+    results = await asyncio.gather(
+        *(
+            svc.search_taxa(c.query, scopes={c.scope}, match=c.match, fuzzy=False, limit=100)
+            for c in CASES
         )
-        baseline[(c.query, c.scope, c.match)] = taxon_ids(res)
+    )
+    return [taxon_ids(res) for res in results]
 
-    dsn = resolve_test_dsn()
-    if not dsn:
-        pytest.skip("No Postgres DSN; baseline only")
 
-    pg_svc = PostgresTaxonomyService(dsn)
+@pytest_asyncio.fixture(scope="session")
+async def sqlite_baseline(taxonomy_service) -> list[list[int]]:
+    """Ids per case from the shared SQLite fixture (truths)."""
+    return await search_cases(taxonomy_service)
 
-    # Determine whether datasets match (row count heuristic)
-    s_count = sqlite_fixture_count()
-    try:
-        p_count = await pg_table_count(dsn)
-    except Exception as e:
-        if is_database_unavailable_error(e):
-            pytest.skip(f"Postgres database unavailable: {e}")
-        raise
-    datasets_match = s_count == p_count
 
-    warnings: list[str] = []
-    for c in CASES:
+def test_sqlite_baseline_seeded_queries(sqlite_baseline):
+    for c, ids in zip(CASES, sqlite_baseline):
+        assert ids, f"No SQLite results for {c.scope}:{c.match} '{c.query}'"
+
+
+@pytest.mark.asyncio
+@pytest.mark.pg_optional
+@pytest.mark.skipif(not PG_DSN, reason="No Postgres DSN; baseline only")
+async def test_cross_backend_parity_seeded_queries(sqlite_baseline, sqlite_count):
+    assert PG_DSN
+    pg_svc = PostgresTaxonomyService(PG_DSN)
+    try:
+        # Determine whether datasets match (row count heuristic)
         try:
-            res_pg = await pg_svc.search_taxa(
-                c.query,
-                scopes={c.scope},
-                match=c.match,
-                fuzzy=False,
-                limit=100,
-            )
-        except RuntimeError as e:
+            p_count = await pg_table_count(pg_svc, PG_DSN)
+            pg_results = await search_cases(pg_svc)
+        except Exception as e:
             if is_database_unavailable_error(e):
                 pytest.skip(f"Postgres database unavailable: {e}")
             raise
-        pg_ids = taxon_ids(res_pg)
-        base_ids = baseline[(c.query, c.scope, c.match)]
+    finally:
+        await pg_svc.aclose()
+    datasets_match = sqlite_count == p_count
 
+    warnings: list[str] = []
+    for c, base_ids, pg_ids in zip(CASES, sqlite_baseline, pg_results):
         if datasets_match:
             # Strict equality and ordering when datasets match
             assert (
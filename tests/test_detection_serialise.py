@@ -1,4 +1,5 @@
 import json
+from types import MappingProxyType
 
 import pytest
 
@@ -131,7 +132,8 @@ def test_image_detection_result_serialisation():
 
 # --- COCO Utils Tests ---
 
-CATEGORY_MAP = {123: 1, 456: 2}  # typus_taxon_id -> coco_category_id
+# Read-only: shared by every COCO test
+CATEGORY_MAP = MappingProxyType({123: 1, 456: 2})  # typus_taxon_id -> coco_category_id
 
 
 def test_to_coco_basic():
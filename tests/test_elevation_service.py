@@ -9,14 +9,18 @@ ELEVATION_DSN = (
 )
 ELEVATION_TABLE = os.getenv("ELEVATION_TABLE", "elevation_raster")
 
+pytestmark = [
+    pytest.mark.skipif(
+        os.getenv("TYPUS_ELEVATION_TEST", "0") not in {"1", "true", "TRUE", "yes"},
+        reason="TYPUS_ELEVATION_TEST not enabled",
+    ),
+    pytest.mark.skipif(not ELEVATION_DSN, reason="No DSN for elevation tests"),
+]
+
 
 @pytest.mark.asyncio
 async def test_elevation_la_smoke():
-    if os.getenv("TYPUS_ELEVATION_TEST", "0") not in {"1", "true", "TRUE", "yes"}:
-        pytest.skip("TYPUS_ELEVATION_TEST not enabled")
-    if not ELEVATION_DSN:
-        pytest.skip("No DSN for elevation tests")
-
+    assert ELEVATION_DSN
     svc = PostgresRasterElevation(ELEVATION_DSN, raster_table=ELEVATION_TABLE)
 
     # Los Angeles, CA
@@ -30,11 +34,7 @@ async def test_elevation_la_smoke():
 
 @pytest.mark.asyncio
 async def test_elevations_batch_smoke():
-    if os.getenv("TYPUS_ELEVATION_TEST", "0") not in {"1", "true", "TRUE", "yes"}:
-        pytest.skip("TYPUS_ELEVATION_TEST not enabled")
-    if not ELEVATION_DSN:
-        pytest.skip("No DSN for elevation tests")
-
+    assert ELEVATION_DSN
     svc = PostgresRasterElevation(ELEVATION_DSN, raster_table=ELEVATION_TABLE)
 
     # LA (land), Central Atlantic (ocean), NYC (land)
@@ -1,6 +1,9 @@
+import asyncio
+
 import pytest
 
 from typus.orm.expanded_taxa import ExpandedTaxa
+from typus.services.taxonomy.common import LRUCache
 
 
 def test_orm_smoke():
@@ -18,16 +21,30 @@ def test_orm_smoke():
 
 @pytest.mark.asyncio
 async def test_lca_sqlite(taxonomy_service):
-    assert (await taxonomy_service.lca({47219, 54327})).taxon_id == 47201
-    assert (await taxonomy_service.lca({52775, 47220})).taxon_id == 47221
-    assert (await taxonomy_service.lca({61356, 54328})).taxon_id == 52747
-    assert (await taxonomy_service.lca({47219})).taxon_id == 47219
+    results = await asyncio.gather(
+        taxonomy_service.lca({47219, 54327}),
+        taxonomy_service.lca({52775, 47220}),
+        taxonomy_service.lca({61356, 54328}),
+        taxonomy_service.lca({47219}),
+    )
+    assert [t.taxon_id for t in results] == [47201, 47221, 52747, 47219]
 
 
 @pytest.mark.asyncio
 async def test_distance_sqlite(taxonomy_service):
-    assert await taxonomy_service.distance(47219, 54327, inclusive=False) == 6
-    assert await taxonomy_service.distance(52775, 47220, inclusive=False) == 2
+    results = await asyncio.gather(
+        taxonomy_service.distance(47219, 54327, inclusive=False),
+        taxonomy_service.distance(52775, 47220, inclusive=False),
+    )
+    assert results == [6, 2]
+
+
+@pytest.mark.asyncio
+async def test_ancestry_pairs_cached_sqlite(taxonomy_service):
+    await taxonomy_service.lca({52775, 47220}, include_minor_ranks=True)
+    cached = taxonomy_service._ancestry_pairs_cache[52775]
+    assert await taxonomy_service._expanded_ancestry_pairs(52775) == list(cached)
+    assert [tid for tid, _ in cached] == (await taxonomy_service.get_taxon(52775)).ancestry
 
 
 @pytest.mark.asyncio
@@ -35,3 +52,20 @@ async def test_children_sqlite(taxonomy_service):
     res = await taxonomy_service.children(47221)
     children = {t.taxon_id for t in res}
     assert children == {47220, 52775}
+
+
+@pytest.mark.asyncio
+async def test_lca_memoized_by_id_set(taxonomy_service):
+    first = await taxonomy_service.lca({61356, 54328})
+    assert taxonomy_service._lca_cache[(frozenset({61356, 54328}), False)] == first.taxon_id
+    again = await taxonomy_service.lca({54328, 61356})
+    assert again == first and again is not first
+
+
+@pytest.mark.asyncio
+async def test_lca_memo_is_bounded(taxonomy_service, monkeypatch):
+    monkeypatch.setattr(taxonomy_service, "_lca_cache", LRUCache(1))
+    await taxonomy_service.lca({47219, 54327})
+    await taxonomy_service.lca({52775, 47220})
+    assert len(taxonomy_service._lca_cache) == 1
+    assert (frozenset({52775, 47220}), False) in taxonomy_service._lca_cache
@@ -3,7 +3,7 @@
 import pytest
 from pydantic import ValidationError
 
-from typus.models.geometry import BBoxXYWHNorm
+from typus.models.geometry import BBoxArrayXYWHNorm, BBoxXYWHNorm, to_xyxy_px
 
 
 class TestBBoxXYWHNormValidation:
@@ -142,3 +142,31 @@ class TestBBoxXYWHNormValidation:
         assert "Top coordinate" in schema["properties"]["y"]["description"]
         assert "Width" in schema["properties"]["w"]["description"]
         assert "Height" in schema["properties"]["h"]["description"]
+
+    def test_from_rows_matches_constructor(self):
+        """Bulk validation agrees with per-instance construction."""
+        rows = [((i % 50) / 100, (i % 30) / 100, 0.25, 0.5) for i in range(10_000)]
+        boxes = BBoxXYWHNorm.from_rows(rows)
+        assert boxes == [BBoxXYWHNorm(x=x, y=y, w=w, h=h) for x, y, w, h in rows]
+
+        with pytest.raises(ValidationError, match="x \\+ w exceeds 1") as exc:
+            BBoxXYWHNorm.from_rows([(0.1, 0.1, 0.2, 0.2), (0.9, 0.1, 0.2, 0.2)])
+        assert exc.value.errors()[0]["loc"][0] == 1
+
+        with pytest.raises(ValidationError):
+            BBoxXYWHNorm.from_rows([(float("nan"), 0.1, 0.2, 0.2)])
+
+    def test_bbox_array_packs_boxes(self):
+        """The packed column round-trips boxes at 32 bytes each."""
+        boxes = BBoxXYWHNorm.from_rows(
+            [((i % 50) / 100, (i % 30) / 100, 0.25, 0.5) for i in range(10_000)]
+        )
+        packed = BBoxArrayXYWHNorm.from_iterable(boxes)
+
+        assert len(packed) == 10_000
+        assert packed.nbytes == 32 * 10_000
+        assert packed[0] == boxes[0] and packed[-1] == boxes[-1]
+        assert list(packed) == boxes
+        assert packed.to_xyxy_px_batch(1920, 1080) == [to_xyxy_px(b, 1920, 1080) for b in boxes]
+        with pytest.raises(IndexError):
+            packed[10_000]
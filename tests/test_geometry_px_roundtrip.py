@@ -1,55 +1,89 @@
 """Tests for pixel ↔ normalized bbox conversion round-trips."""
 
+from array import array
+
 import pytest
 
-from typus.models.geometry import BBoxXYWHNorm, from_xyxy_px, to_xyxy_px
+from typus.models.geometry import (
+    BBoxArrayXYWHNorm,
+    BBoxXYWHNorm,
+    from_xyxy_px,
+    from_xyxy_px_batch,
+    to_xyxy_px,
+    to_xyxy_px_batch,
+)
 
 
 class TestPixelNormalizedRoundtrip:
     """Test round-trip conversions between pixel and normalized coordinates."""
 
-    @pytest.mark.parametrize(
-        "W,H",
-        [
+    def test_roundtrip_accuracy(self):
+        """Test that pixel -> norm -> pixel conversion is accurate within 0.5px."""
+        sizes = [
             (100, 100),  # Square
             (1920, 1080),  # HD video
             (640, 480),  # VGA
             (3840, 2160),  # 4K
             (1, 1),  # Edge case
             (800, 600),  # 4:3 aspect ratio
-        ],
-    )
-    def test_roundtrip_accuracy(self, W: int, H: int):
-        """Test that pixel -> norm -> pixel conversion is accurate within 0.5px."""
-        # Test various bbox configurations
-        test_cases = [
-            # (x1, y1, x2, y2) in pixels
-            (10, 20, 50, 60),  # Small bbox
-            (0, 0, W // 2, H // 2),  # Top-left quadrant
-            (W // 2, H // 2, W, H),  # Bottom-right quadrant
-            (0, 0, W, H),  # Full image
-            (W // 4, H // 4, 3 * W // 4, 3 * H // 4),  # Centered box
-            (1, 1, 2, 2),  # Minimal size
         ]
-
-        for x1_orig, y1_orig, x2_orig, y2_orig in test_cases:
+        for W, H in sizes:
+            # (x1, y1, x2, y2) in pixels
+            test_cases = [
+                (10, 20, 50, 60),  # Small bbox
+                (0, 0, W // 2, H // 2),  # Top-left quadrant
+                (W // 2, H // 2, W, H),  # Bottom-right quadrant
+                (0, 0, W, H),  # Full image
+                (W // 4, H // 4, 3 * W // 4, 3 * H // 4),  # Centered box
+                (1, 1, 2, 2),  # Minimal size
+            ]
             # Skip invalid cases
-            if x2_orig <= x1_orig or y2_orig <= y1_orig:
-                continue
-            if x1_orig < 0 or y1_orig < 0 or x2_orig > W or y2_orig > H:
-                continue
-
-            # Convert pixels to normalized
-            bbox_norm = from_xyxy_px(x1_orig, y1_orig, x2_orig, y2_orig, W, H)
-
-            # Convert back to pixels
-            x1_round, y1_round, x2_round, y2_round = to_xyxy_px(bbox_norm, W, H)
-
-            # Check accuracy within 0.5 pixels
-            assert abs(x1_round - x1_orig) <= 0.5, f"x1 error: {abs(x1_round - x1_orig)}"
-            assert abs(y1_round - y1_orig) <= 0.5, f"y1 error: {abs(y1_round - y1_orig)}"
-            assert abs(x2_round - x2_orig) <= 0.5, f"x2 error: {abs(x2_round - x2_orig)}"
-            assert abs(y2_round - y2_orig) <= 0.5, f"y2 error: {abs(y2_round - y2_orig)}"
+            valid = [
+                (x1, y1, x2, y2)
+                for x1, y1, x2, y2 in test_cases
+                if x2 > x1 and y2 > y1 and x1 >= 0 and y1 >= 0 and x2 <= W and y2 <= H
+            ]
+
+            # pixels -> normalized -> pixels in one pass per direction
+            # (test_batch_matches_scalar pins the batch helpers to the scalar functions)
+            rounded = to_xyxy_px_batch(from_xyxy_px_batch(valid, W, H), W, H)
+            worst = max(
+                abs(b - o) for orig, back in zip(valid, rounded) for o, b in zip(orig, back)
+            )
+            assert worst <= 0.5, f"round-trip error {worst} at {W}x{H}"
+
+    @pytest.mark.parametrize("W,H", [(100, 100), (1920, 1080), (1, 1)])
+    def test_batch_matches_scalar(self, W: int, H: int):
+        """Batch conversions agree with the scalar functions row for row."""
+        rows = [
+            (0, 0, W, H),
+            (0, 0, max(1, W // 2), max(1, H // 2)),
+            (W / 3, H / 3, 2 * W / 3, 2 * H / 3),
+            (-5, -5, W + 5, H + 5),  # clamped
+            (0.25, 0.25, 0.75, 0.75),
+        ]
+        boxes = from_xyxy_px_batch(rows, W, H)
+        assert boxes == [from_xyxy_px(*r, W, H) for r in rows]
+        assert to_xyxy_px_batch(boxes, W, H) == [to_xyxy_px(b, W, H) for b in boxes]
+
+        with pytest.raises(ValueError, match="row 1"):
+            from_xyxy_px_batch([(0, 0, 1, 1), (5, 5, 5, 6)], W, H)
+
+    def test_packed_into_reuses_buffer(self):
+        """``to_xyxy_px_into`` fills the caller's buffer without reallocating it."""
+        W, H = 1920, 1080
+        rows = [(0, 0, W, H), (10, 20, 50, 60), (W // 4, H // 4, 3 * W // 4, 3 * H // 4)]
+        packed = BBoxArrayXYWHNorm.from_iterable(from_xyxy_px_batch(rows, W, H))
+        out = array("l", bytes(4 * len(rows) * array("l").itemsize))
+        address = out.buffer_info()[0]
+
+        for _ in range(2):
+            assert packed.to_xyxy_px_into(out, W, H) is out
+            assert out.buffer_info()[0] == address
+        assert [tuple(out[i : i + 4]) for i in range(0, len(out), 4)] == rows
+
+        with pytest.raises(ValueError, match="expected 12"):
+            packed.to_xyxy_px_into(array("l", [0] * 4), W, H)
 
     def test_edge_coordinates(self):
         """Test conversion of edge and corner coordinates."""
@@ -1,8 +1,9 @@
 """Tests for models using canonical bbox types (Detection, Track)."""
 
 import pytest
+from pydantic import ValidationError
 
-from typus.models.geometry import BBoxXYWHNorm
+from typus.models.geometry import BBoxMapper, BBoxXYWHNorm
 from typus.models.tracks import Detection, Track
 
 
@@ -68,6 +69,79 @@ class TestDetectionCanonicalBbox:
         assert detection.frame_number == 100
         assert detection.confidence == 0.95
 
+    def test_detection_from_raw_batch_matches_per_row(self):
+        """Batch ingest agrees with from_raw_detection, with and without a provider."""
+        rows = [
+            {
+                "frame_number": 100,
+                "bbox_norm": {"x": 0.1, "y": 0.2, "w": 0.3, "h": 0.4},
+                "confidence": 0.95,
+            },
+            {"frame_number": 101, "bbox": [10.0, 20.0, 30.0, 40.0], "confidence": 0.9},
+        ]
+        assert Detection.from_raw_batch(rows) == [Detection.from_raw_detection(r) for r in rows]
+
+        gemini = [{"frame_number": 100, "bbox": [50, 50, 80, 90], "confidence": 0.95}]
+        kw = {"upload_w": 100, "upload_h": 100, "provider": "gemini_br_xyxy"}
+        assert Detection.from_raw_batch(gemini, **kw) == [
+            Detection.from_raw_detection(gemini[0], **kw)
+        ]
+
+        with pytest.raises(ValidationError, match="Either bbox_norm or bbox"):
+            Detection.from_raw_batch([rows[0], {"frame_number": 1, "confidence": 0.5}])
+
+    def test_detection_from_raw_batch_follows_replaced_mapper(self, monkeypatch):
+        """Replacing a scalar mapper also retires its batch form, so both ingest paths agree."""
+        name = "gemini_br_xyxy"
+        # Snapshot both registries; restored on teardown
+        monkeypatch.setitem(BBoxMapper._REG, name, BBoxMapper._REG[name])
+        monkeypatch.setitem(BBoxMapper._BATCH_REG, name, BBoxMapper._BATCH_REG[name])
+
+        def tl_xyxy(x1, y1, x2, y2, W, H) -> BBoxXYWHNorm:
+            return BBoxXYWHNorm(x=x1 / W, y=y1 / H, w=(x2 - x1) / W, h=(y2 - y1) / H)
+
+        BBoxMapper.register(name, tl_xyxy, replace=True)
+        rows = [
+            {"frame_number": 100, "bbox": [50, 50, 80, 90], "confidence": 0.95},
+            {"frame_number": 101, "bbox": [0, 0, 100, 100], "confidence": 0.9},
+        ]
+        per_row = [
+            Detection.from_raw_detection(r, upload_w=100, upload_h=100, provider=name) for r in rows
+        ]
+        batch = Detection.from_raw_batch(rows, upload_w=100, upload_h=100, provider=name)
+        assert batch == per_row
+        assert batch[0].bbox_norm is not None and batch[0].bbox_norm.x == 0.5
+
+    def test_detection_from_raw_batch_maps_provider_rows_in_one_call(self, monkeypatch):
+        """Provider rows go through the batch mapper once and match the scalar path."""
+        rows = [
+            {"frame_number": 100, "bbox": [50, 50, 80, 90], "confidence": 0.95},
+            {"frame_number": 101, "bbox": [0, 0, 100, 100], "confidence": 0.9, "taxon_id": 1},
+            {"frame_number": 102, "bbox": [10, 20, 15, 33], "confidence": 0.5},
+        ]
+        expected = [
+            Detection.from_raw_detection(r, upload_w=100, upload_h=100, provider="gemini_br_xyxy")
+            for r in rows
+        ]
+
+        batch_fn = BBoxMapper.get_batch("gemini_br_xyxy")
+        calls = []
+
+        def counting_batch(boxes, W, H):
+            calls.append(len(boxes))
+            return batch_fn(boxes, W, H)
+
+        def no_scalar(*args):
+            raise AssertionError("scalar mapper used")
+
+        monkeypatch.setitem(BBoxMapper._BATCH_REG, "gemini_br_xyxy", counting_batch)
+        monkeypatch.setitem(BBoxMapper._REG, "gemini_br_xyxy", no_scalar)
+        batch = Detection.from_raw_batch(
+            rows, upload_w=100, upload_h=100, provider="gemini_br_xyxy"
+        )
+        assert batch == expected
+        assert calls == [3]
+
     def test_detection_from_raw_without_provider(self):
         """Test Detection.from_raw_detection without provider (direct construction)."""
         raw_data = {
@@ -194,6 +268,35 @@ class TestTrackWithCanonicalBbox:
         assert track.duration_frames == 2
         assert abs(track.duration_seconds - 2.0 / 30.0) < 1e-6
 
+    def test_track_to_columns(self):
+        """Detections pack into per-field columns in order."""
+        track = Track.from_raw_detections(
+            track_id="track_cols",
+            clip_id="video_cols",
+            detections=[
+                {
+                    "frame_number": 100,
+                    "bbox_norm": {"x": 0.1, "y": 0.2, "w": 0.3, "h": 0.4},
+                    "confidence": 0.95,
+                },
+                {
+                    "frame_number": 101,
+                    "bbox_norm": {"x": 0.15, "y": 0.25, "w": 0.25, "h": 0.35},
+                    "confidence": 0.9,
+                },
+            ],
+        )
+        cols = track.to_columns()
+
+        assert list(cols["frame_number"]) == [100, 101]
+        assert list(cols["confidence"]) == [0.95, 0.9]
+        assert list(cols["bbox_norm"]) == [d.bbox_norm for d in track.detections]
+
+        legacy = Detection(frame_number=102, bbox=[10.0, 20.0, 30.0, 40.0], confidence=0.9)
+        track.detections.append(legacy)
+        with pytest.raises(ValueError, match="detection 2"):
+            track.to_columns()
+
     def test_track_mixed_bbox_types(self):
         """Test Track with mix of canonical and legacy bbox detections."""
         # One detection with canonical bbox
@@ -129,3 +129,39 @@ async def test_postgres_parity_when_available():
             pytest.skip(f"Postgres database unavailable: {e}")
         raise
     assert 47219 in taxon_ids(res)
+
+
+def test_batched_row_scores_match_pairwise_scores():
+    from typus.services.taxonomy.common import score_search_rows, score_taxon_match
+
+    rows = [
+        {"name": "Apis mellifera", "commonName": "honey bee"},
+        {"name": "Apis cerana", "commonName": None},
+        {"name": "Bombus", "commonName": "bumble bees"},
+        {"name": None, "commonName": "western honey bee"},
+    ]
+    for scopes in ({"scientific"}, {"vernacular"}, {"scientific", "vernacular"}):
+        expected = [
+            score_taxon_match(
+                " Honey bee ",
+                scientific_name=r["name"],
+                vernacular_name=r["commonName"],
+                scopes=scopes,
+            )
+            for r in rows
+        ]
+        assert score_search_rows(" Honey bee ", rows, scopes=scopes) == pytest.approx(expected)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_prefix_is_literal_and_indexed(taxonomy_service):
+    # Prefix search is a range on LOWER(name): LIKE wildcards in the query are literal
+    res = await taxonomy_service.search_taxa(
+        "Api_", scopes={"scientific"}, match="prefix", fuzzy=False
+    )
+    assert res == []
+    plan = taxonomy_service._conn.execute(
+        'EXPLAIN QUERY PLAN SELECT "taxonID" FROM expanded_taxa '
+        "WHERE LOWER(\"name\") >= 'apis' AND LOWER(\"name\") < 'apit'"
+    ).fetchall()
+    assert any("idx_expanded_taxa_lower_name" in row[3] for row in plan)
@@ -126,6 +126,18 @@ class TestGeminiBRMapping:
         with pytest.raises(ValueError):
             mapper_fn(80, 50, 50, 90, W, H)  # Would create x2 < x1 in TL system
 
+    def test_gemini_batch_matches_scalar(self):
+        """The batch form agrees with the scalar mapper row for row."""
+        W, H = 1920, 1080
+        rows = [(50, 50, 80, 90), (0, 0, W, H), (900, 0, 1000, 100), (480, 270, 1440, 810)]
+        mapper_fn = BBoxMapper.get("gemini_br_xyxy")
+
+        batch = BBoxMapper.get_batch("gemini_br_xyxy")(rows, W, H)
+        assert batch == [mapper_fn(*r, W, H) for r in rows]
+
+        with pytest.raises(ValueError, match="row 1"):
+            BBoxMapper.get_batch("gemini_br_xyxy")([rows[0], (80, 50, 50, 90)], W, H)
+
 
 class TestBBoxMapperRegistry:
     """Test the BBoxMapper registry system."""
@@ -194,3 +206,18 @@ class TestBBoxMapperRegistry:
         BBoxMapper.register("test_overwrite_protection", mapper2, replace=True)
         result2 = BBoxMapper.get("test_overwrite_protection")(0, 0, 10, 10, 100, 100)
         assert result2.x == 0.2  # Should use the new mapper
+
+    def test_get_batch_falls_back_to_scalar(self):
+        """Providers without a batch form are applied row by row."""
+
+        def tl_mapper(x1, y1, x2, y2, W, H) -> BBoxXYWHNorm:
+            return BBoxXYWHNorm(x=x1 / W, y=y1 / H, w=(x2 - x1) / W, h=(y2 - y1) / H)
+
+        BBoxMapper.register("test_scalar_only", tl_mapper, replace=True)
+        boxes = BBoxMapper.get_batch("test_scalar_only")(
+            [(10, 20, 50, 60), (0, 0, 100, 100)], 100, 100
+        )
+        assert boxes == [tl_mapper(10, 20, 50, 60, 100, 100), tl_mapper(0, 0, 100, 100, 100, 100)]
+
+        with pytest.raises(KeyError, match="No bbox mapper registered"):
+            BBoxMapper.register_batch("test_unregistered_batch", lambda rows, W, H: [])
@@ -1,13 +1,16 @@
+import functools
 import gzip
 import sqlite3
 from pathlib import Path
 
 import pytest
 
+from typus.services import sqlite_loader
 from typus.services.sqlite_loader import load_expanded_taxa
 
 
-def row_count(db: Path) -> int:
+@functools.lru_cache(maxsize=None)
+def _row_count(db: str, mtime_ns: int, size: int) -> int:
     conn = sqlite3.connect(db)
     try:
         cur = conn.execute("SELECT COUNT(*) FROM expanded_taxa")
@@ -16,11 +19,72 @@ def row_count(db: Path) -> int:
         conn.close()
 
 
+def row_count(db: Path) -> int:
+    # Keyed on stat, so a reload of the same path is counted afresh
+    st = db.stat()
+    return _row_count(str(db), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _tsv_lines(tsv: str, mtime_ns: int, size: int) -> int:
+    with open(tsv, "rb") as fh:
+        return sum(1 for _ in fh)
+
+
+def tsv_rows(tsv: Path) -> int:
+    """Data rows in ``tsv`` (header excluded)."""
+    st = tsv.stat()
+    return _tsv_lines(str(tsv), st.st_mtime_ns, st.st_size) - 1
+
+
 def test_round_trip_tsv(tmp_path: Path) -> None:
     db = tmp_path / "exp.sqlite"
     tsv = Path("tests/sample_tsv/expanded_taxa_sample.tsv")
     load_expanded_taxa(db, tsv_path=tsv)
-    assert row_count(db) == sum(1 for _ in tsv.open()) - 1
+    assert row_count(db) == tsv_rows(tsv)
+
+
+def test_taxon_active_flag_normalised(tmp_path: Path) -> None:
+    tsv = tmp_path / "flags.tsv"
+    tsv.write_text(
+        "taxonID\trankLevel\tname\ttaxonActive\n"
+        "1\t70\tA\tt\n"
+        "2\t70\tB\tT\n"
+        "3\t70\tC\tf\n"
+        "4\t70\tD\t\n"
+        "5\t70\tE\t1\n"
+        "6\t70\tF\t0\n"
+        "7\t70\tG\ttrue\n"
+    )
+    db = tmp_path / "flags.sqlite"
+    load_expanded_taxa(db, tsv_path=tsv)
+    conn = sqlite3.connect(db)
+    try:
+        rows = conn.execute('SELECT "taxonID", "taxonActive" FROM expanded_taxa ORDER BY 1')
+        assert rows.fetchall() == [(1, 1), (2, 1), (3, 0), (4, 0), (5, 1), (6, 0), (7, 1)]
+    finally:
+        conn.close()
+
+
+def test_tsv_self_consistent_fills_missing_ancestors(tmp_path: Path) -> None:
+    tsv = tmp_path / "dangling.tsv"
+    tsv.write_text(
+        "taxonID\trankLevel\tname\timmediateAncestor_taxonID\timmediateAncestor_rankLevel"
+        "\timmediateMajorAncestor_taxonID\timmediateMajorAncestor_rankLevel\n"
+        "1\t70\tLife\t\t\t\t\n"
+        "2\t60\tPhylum\t1\t70\t1\t70\n"
+        "3\t10\tSpecies\t99\t20\t2\t60\n"  # ancestor 99 is not in the table
+    )
+    query = 'SELECT "taxonID", "immediateAncestor_taxonID" FROM expanded_taxa ORDER BY 1'
+    for force, expected in ((False, (3, 99)), (True, (3, 2))):
+        db = tmp_path / f"dangling-{force}.sqlite"
+        load_expanded_taxa(db, tsv_path=tsv, force_self_consistent=force)
+        conn = sqlite3.connect(db)
+        try:
+            rows = conn.execute(query).fetchall()
+        finally:
+            conn.close()
+        assert rows[1:] == [(2, 1), expected]
 
 
 def test_auto_download_fallback(httpserver, tmp_path: Path) -> None:
@@ -34,7 +98,7 @@ def test_auto_download_fallback(httpserver, tmp_path: Path) -> None:
 
     db = tmp_path / "exp.sqlite"
     load_expanded_taxa(db, url=url, cache_dir=tmp_path)
-    assert row_count(db) == sum(1 for _ in tsv.open()) - 1
+    assert row_count(db) == tsv_rows(tsv)
 
 
 def test_cache_hit(tmp_path: Path) -> None:
@@ -52,9 +116,46 @@ def test_replace_append(tmp_path: Path) -> None:
     tsv = Path("tests/sample_tsv/expanded_taxa_sample.tsv")
     load_expanded_taxa(db, tsv_path=tsv)
     load_expanded_taxa(db, tsv_path=tsv, if_exists="append")
-    assert row_count(db) == 2 * (sum(1 for _ in tsv.open()) - 1)
+    assert row_count(db) == 2 * tsv_rows(tsv)
     load_expanded_taxa(db, tsv_path=tsv, if_exists="replace")
-    assert row_count(db) == sum(1 for _ in tsv.open()) - 1
+    assert row_count(db) == tsv_rows(tsv)
+
+
+def test_failed_fresh_load_leaves_no_file(tmp_path: Path, monkeypatch) -> None:
+    db = tmp_path / "exp.sqlite"
+    tsv = Path("tests/sample_tsv/expanded_taxa_sample.tsv")
+
+    def fail(conn: sqlite3.Connection) -> None:
+        raise RuntimeError("load interrupted")
+
+    monkeypatch.setattr(sqlite_loader, "_fill_missing_ancestors", fail)
+    with pytest.raises(RuntimeError):
+        load_expanded_taxa(db, tsv_path=tsv, force_self_consistent=True)
+    assert not db.exists()
+
+
+def test_failed_append_leaves_existing_rows(tmp_path: Path, monkeypatch) -> None:
+    db = tmp_path / "exp.sqlite"
+    tsv = Path("tests/sample_tsv/expanded_taxa_sample.tsv")
+    load_expanded_taxa(db, tsv_path=tsv)
+
+    journal_modes = []
+
+    def fail(conn: sqlite3.Connection) -> None:
+        journal_modes.append(conn.execute("PRAGMA journal_mode").fetchone()[0])
+        raise RuntimeError("load interrupted")
+
+    # Fails after the inserts, inside the load transaction
+    monkeypatch.setattr(sqlite_loader, "_fill_missing_ancestors", fail)
+    with pytest.raises(RuntimeError):
+        load_expanded_taxa(db, tsv_path=tsv, if_exists="append", force_self_consistent=True)
+    assert journal_modes == ["memory"]
+    conn = sqlite3.connect(db)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM expanded_taxa").fetchone()[0] == tsv_rows(tsv)
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    finally:
+        conn.close()
 
 
 def _index_names(db: Path) -> set[str]:
@@ -49,7 +49,14 @@ from .models.classification import (
     TaxonomyContext,
     TaxonSnapshot,
 )
-from .models.geometry import BBoxMapper, BBoxXYWHNorm, from_xyxy_px, to_xyxy_px
+from .models.geometry import (
+    BBoxMapper,
+    BBoxXYWHNorm,
+    from_xyxy_px,
+    from_xyxy_px_batch,
+    to_xyxy_px,
+    to_xyxy_px_batch,
+)
 from .models.lineage import LineageMap
 from .models.summary import TaxonSummary, TaxonTrailNode
 from .models.taxon import Taxon
@@ -88,6 +95,8 @@ __all__ = [
     "BBoxMapper",
     "to_xyxy_px",
     "from_xyxy_px",
+    "to_xyxy_px_batch",
+    "from_xyxy_px_batch",
     "Detection",
     "Track",
     "TrackStats",
@@ -110,15 +110,17 @@ def infer_rank(name: str, *, cutoff: int = 80) -> RankLevel | None:
 
 
 # utility predicates
-MAJOR_LEVELS = {
-    RankLevel.L10,
-    RankLevel.L20,
-    RankLevel.L30,
-    RankLevel.L40,
-    RankLevel.L50,
-    RankLevel.L60,
-    RankLevel.L70,
-}
+MAJOR_LEVELS = frozenset(
+    {
+        RankLevel.L10,
+        RankLevel.L20,
+        RankLevel.L30,
+        RankLevel.L40,
+        RankLevel.L50,
+        RankLevel.L60,
+        RankLevel.L70,
+    }
+)
 
 
 def is_major(rank: RankLevel) -> bool:  # noqa: D401
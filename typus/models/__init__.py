@@ -1,5 +1,14 @@
 from .detection import ImageDetectionResult, InstancePrediction
-from .geometry import BBox, BBoxMapper, BBoxXYWHNorm, EncodedMask, from_xyxy_px, to_xyxy_px
+from .geometry import (
+    BBox,
+    BBoxMapper,
+    BBoxXYWHNorm,
+    EncodedMask,
+    from_xyxy_px,
+    from_xyxy_px_batch,
+    to_xyxy_px,
+    to_xyxy_px_batch,
+)
 
 __all__ = [
     "BBox",
@@ -10,4 +19,6 @@ __all__ = [
     "BBoxMapper",
     "to_xyxy_px",
     "from_xyxy_px",
+    "to_xyxy_px_batch",
+    "from_xyxy_px_batch",
 ]
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Mapping
 
 from typus.models import ImageDetectionResult, InstancePrediction
 from typus.models.geometry import (  # Added BBoxFormat and MaskEncoding
@@ -9,7 +9,7 @@ from typus.models.geometry import (  # Added BBoxFormat and MaskEncoding
 )
 
 
-def to_coco(image: ImageDetectionResult, category_map: Dict[int, int]) -> Dict:
+def to_coco(image: ImageDetectionResult, category_map: Mapping[int, int]) -> Dict:
     """Return a minimal COCO-style dict for a single image.
 
     Args:
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import enum
 import math
-from typing import Callable, Dict, List, Sequence, Tuple
+from array import array
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 
 from .serialise import CompactJsonMixin
 
@@ -51,37 +53,61 @@ def _round_half_up(x: float) -> int:
 class BBoxXYWHNorm(BaseModel):
     """Canonical TL-normalized bbox: [x, y, w, h] with invariants."""
 
-    x: float = Field(ge=0.0, le=1.0, description="Left coordinate (0-1, normalized)")
-    y: float = Field(ge=0.0, le=1.0, description="Top coordinate (0-1, normalized)")
-    w: float = Field(gt=0.0, le=1.0, description="Width (0-1, normalized)")
-    h: float = Field(gt=0.0, le=1.0, description="Height (0-1, normalized)")
+    # Finiteness is enforced by pydantic-core (allow_inf_nan=False) rather than a
+    # Python field validator, which is most of the per-instance construction cost.
+    x: float = Field(
+        ge=0.0, le=1.0, allow_inf_nan=False, description="Left coordinate (0-1, normalized)"
+    )
+    y: float = Field(
+        ge=0.0, le=1.0, allow_inf_nan=False, description="Top coordinate (0-1, normalized)"
+    )
+    w: float = Field(gt=0.0, le=1.0, allow_inf_nan=False, description="Width (0-1, normalized)")
+    h: float = Field(gt=0.0, le=1.0, allow_inf_nan=False, description="Height (0-1, normalized)")
 
     model_config = ConfigDict(frozen=True)
 
-    @field_validator("x", "y", "w", "h")
-    @classmethod
-    def _finite(cls, v: float) -> float:
-        if v != v or v in (float("inf"), float("-inf")):
-            raise ValueError("non-finite coordinate")
-        return v
-
     @model_validator(mode="after")
     def _validate_bounds(self) -> "BBoxXYWHNorm":
-        """Validate that bbox stays within [0,1] bounds."""
-        if self.x + self.w > 1.0 + EPS:
+        """Validate that bbox stays within [0,1] bounds.
+
+        The only Python-level check: per-field ranges and finiteness run in pydantic-core.
+        """
+        limit = 1.0 + EPS
+        if self.x + self.w > limit:
             raise ValueError("x + w exceeds 1")
-        if self.y + self.h > 1.0 + EPS:
+        if self.y + self.h > limit:
             raise ValueError("y + h exceeds 1")
         return self
 
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[float]]) -> List["BBoxXYWHNorm"]:
+        """Validate many ``(x, y, w, h)`` rows in one pydantic-core call.
+
+        Same checks as the constructor, but the per-row loop runs in Rust rather than
+        Python; an invalid row raises a single ``ValidationError`` naming its index.
+        """
+        return _bbox_list_adapter().validate_python(
+            [{"x": x, "y": y, "w": w, "h": h} for x, y, w, h in rows]
+        )
+
+
+@lru_cache(maxsize=1)
+def _bbox_list_adapter() -> TypeAdapter[List[BBoxXYWHNorm]]:
+    # Built on first use so importing the module does not pay for the schema build.
+    return TypeAdapter(List[BBoxXYWHNorm])
+
 
 def to_xyxy_px(b: BBoxXYWHNorm, W: int, H: int) -> Tuple[int, int, int, int]:
     """Convert canonical bbox to pixel XYXY coordinates."""
-    x1 = _round_half_up(b.x * W)
-    y1 = _round_half_up(b.y * H)
-    x2 = _round_half_up((b.x + b.w) * W)
-    y2 = _round_half_up((b.y + b.h) * H)
-    return x1, y1, x2, y2
+    # _round_half_up inlined, and each field read once: this runs per detection per frame.
+    floor = math.floor
+    x, y = b.x, b.y
+    return (
+        int(floor(x * W + 0.5)),
+        int(floor(y * H + 0.5)),
+        int(floor((x + b.w) * W + 0.5)),
+        int(floor((y + b.h) * H + 0.5)),
+    )
 
 
 def from_xyxy_px(x1: float, y1: float, x2: float, y2: float, W: int, H: int) -> BBoxXYWHNorm:
@@ -102,10 +128,126 @@ def from_xyxy_px(x1: float, y1: float, x2: float, y2: float, W: int, H: int) ->
     return BBoxXYWHNorm(x=x, y=y, w=w, h=h)
 
 
+def to_xyxy_px_batch(
+    boxes: Iterable[BBoxXYWHNorm], W: int, H: int
+) -> List[Tuple[int, int, int, int]]:
+    """``to_xyxy_px`` over many boxes, with the per-call lookups hoisted out of the loop."""
+    floor = math.floor
+    out: List[Tuple[int, int, int, int]] = []
+    append = out.append
+    for b in boxes:
+        x, y = b.x, b.y
+        append(
+            (
+                int(floor(x * W + 0.5)),
+                int(floor(y * H + 0.5)),
+                int(floor((x + b.w) * W + 0.5)),
+                int(floor((y + b.h) * H + 0.5)),
+            )
+        )
+    return out
+
+
+def from_xyxy_px_batch(rows: Iterable[Sequence[float]], W: int, H: int) -> List[BBoxXYWHNorm]:
+    """``from_xyxy_px`` over many ``(x1, y1, x2, y2)`` rows.
+
+    The arithmetic and clamping match the scalar function; the resulting boxes are
+    validated together through ``BBoxXYWHNorm.from_rows``.
+    """
+    norm: List[Tuple[float, float, float, float]] = []
+    for i, (x1, y1, x2, y2) in enumerate(rows):
+        if x2 <= x1 or y2 <= y1:
+            raise ValueError(f"xyxy invalid at row {i}: x2<=x1 or y2<=y1")
+        norm.append(
+            (
+                min(1.0, max(0.0, x1 / W)),
+                min(1.0, max(0.0, y1 / H)),
+                min(1.0, max(EPS, (x2 - x1) / W)),
+                min(1.0, max(EPS, (y2 - y1) / H)),
+            )
+        )
+    return BBoxXYWHNorm.from_rows(norm)
+
+
+class BBoxArrayXYWHNorm:
+    """Read-only column of canonical bboxes packed into one flat ``array('d')``.
+
+    Holds ``x, y, w, h`` contiguously (32 bytes per box rather than a pydantic
+    instance each); a ``BBoxXYWHNorm`` is only built when an item is indexed.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: array) -> None:
+        if data.typecode != "d" or len(data) % 4:
+            raise ValueError("expected array('d') holding 4 values per box")
+        self._data = data
+
+    @classmethod
+    def from_iterable(cls, boxes: Iterable[BBoxXYWHNorm]) -> "BBoxArrayXYWHNorm":
+        data = array("d")
+        for b in boxes:
+            data.extend((b.x, b.y, b.w, b.h))
+        return cls(data)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) * self._data.itemsize
+
+    def __len__(self) -> int:
+        return len(self._data) // 4
+
+    def __getitem__(self, i: int) -> BBoxXYWHNorm:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("bbox index out of range")
+        x, y, w, h = self._data[4 * i : 4 * i + 4]
+        return BBoxXYWHNorm(x=x, y=y, w=w, h=h)
+
+    def __iter__(self) -> Iterator[BBoxXYWHNorm]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_xyxy_px_batch(self, W: int, H: int) -> List[Tuple[int, int, int, int]]:
+        """``to_xyxy_px`` for every box, read straight from the packed values."""
+        floor = math.floor
+        it = iter(self._data)
+        return [
+            (
+                int(floor(x * W + 0.5)),
+                int(floor(y * H + 0.5)),
+                int(floor((x + w) * W + 0.5)),
+                int(floor((y + h) * H + 0.5)),
+            )
+            for x, y, w, h in zip(it, it, it, it)
+        ]
+
+    def to_xyxy_px_into(self, out: array, W: int, H: int) -> array:
+        """Write the pixel ``x1, y1, x2, y2`` of every box into a preallocated *out*.
+
+        *out* is an integer ``array`` with four slots per box, reused across calls;
+        it is filled in place (nothing is allocated per box) and returned.
+        """
+        data = self._data
+        if len(out) != len(data):
+            raise ValueError(f"out holds {len(out)} values, expected {len(data)}")
+        floor = math.floor
+        for j in range(0, len(data), 4):
+            x, y = data[j], data[j + 1]
+            out[j] = int(floor(x * W + 0.5))
+            out[j + 1] = int(floor(y * H + 0.5))
+            out[j + 2] = int(floor((x + data[j + 2]) * W + 0.5))
+            out[j + 3] = int(floor((y + data[j + 3]) * H + 0.5))
+        return out
+
+
 class BBoxMapper:
     """Registry for provider-specific bbox mapping functions."""
 
     _REG: Dict[str, Callable[..., BBoxXYWHNorm]] = {}
+    _BATCH_REG: Dict[str, Callable[..., List[BBoxXYWHNorm]]] = {}
 
     @classmethod
     def register(cls, name: str, fn: Callable[..., BBoxXYWHNorm], *, replace: bool = False) -> None:
@@ -114,7 +256,9 @@ class BBoxMapper:
         Args:
             name: Provider name identifier
             fn: Mapping function that returns BBoxXYWHNorm
-            replace: If True, allows overwriting existing mappings
+            replace: If True, allows overwriting existing mappings (a batch form
+                registered for the old mapper is dropped; ``get_batch`` falls back to
+                the new scalar mapper until ``register_batch`` is called again)
 
         Raises:
             KeyError: If name already exists and replace=False
@@ -122,13 +266,55 @@ class BBoxMapper:
         if name in cls._REG and not replace:
             raise KeyError(f"Bbox mapper '{name}' already exists; pass replace=True to overwrite")
         cls._REG[name] = fn
+        cls._BATCH_REG.pop(name, None)
 
     @classmethod
     def get(cls, name: str) -> Callable[..., BBoxXYWHNorm]:
         """Get a registered bbox mapping function."""
+        fn = cls._REG.get(name)
+        if fn is None:
+            raise KeyError(f"No bbox mapper registered for '{name}'")
+        return fn
+
+    @classmethod
+    def register_batch(
+        cls, name: str, fn: Callable[..., List[BBoxXYWHNorm]], *, replace: bool = False
+    ) -> None:
+        """Register a many-box form of an already registered mapping.
+
+        Args:
+            name: Provider name identifier (its scalar mapper must be registered)
+            fn: ``fn(rows, W, H)`` returning one BBoxXYWHNorm per row, in order
+            replace: If True, allows overwriting an existing batch mapping
+
+        Raises:
+            KeyError: If no scalar mapper is registered under name, or a batch
+                mapping already exists and replace=False
+        """
         if name not in cls._REG:
             raise KeyError(f"No bbox mapper registered for '{name}'")
-        return cls._REG[name]
+        if name in cls._BATCH_REG and not replace:
+            raise KeyError(
+                f"Batch bbox mapper '{name}' already exists; pass replace=True to overwrite"
+            )
+        cls._BATCH_REG[name] = fn
+
+    @classmethod
+    def get_batch(cls, name: str) -> Callable[..., List[BBoxXYWHNorm]]:
+        """Get ``fn(rows, W, H)`` mapping many boxes at once.
+
+        Providers without a registered batch form get the scalar mapper applied row
+        by row, so every provider can be called this way.
+        """
+        batch = cls._BATCH_REG.get(name)
+        if batch is not None:
+            return batch
+        fn = cls.get(name)
+
+        def _per_row(rows: Iterable[Sequence[float]], W: int, H: int) -> List[BBoxXYWHNorm]:
+            return [fn(*row, W, H) for row in rows]
+
+        return _per_row
 
     @classmethod
     def list_providers(cls) -> List[str]:
@@ -160,8 +346,16 @@ def _gemini_br_xyxy_to_norm(
     return from_xyxy_px(tl_x1, tl_y1, tl_x2, tl_y2, W, H)
 
 
+def _gemini_br_xyxy_to_norm_batch(
+    rows: Iterable[Sequence[float]], W: int, H: int
+) -> List[BBoxXYWHNorm]:
+    """``_gemini_br_xyxy_to_norm`` over many rows, validated together."""
+    return from_xyxy_px_batch([(W - x2, H - y2, W - x1, H - y1) for x1, y1, x2, y2 in rows], W, H)
+
+
 # Register the Gemini BR->TL mapper
 BBoxMapper.register("gemini_br_xyxy", _gemini_br_xyxy_to_norm)
+BBoxMapper.register_batch("gemini_br_xyxy", _gemini_br_xyxy_to_norm_batch)
 
 
 def infer_from_raw(
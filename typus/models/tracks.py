@@ -7,12 +7,14 @@ statistical summaries, and validation metadata.
 
 from __future__ import annotations
 
+from array import array
 from datetime import datetime
+from functools import lru_cache
 from typing import Literal, Optional
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
 
-from .geometry import BBoxMapper, BBoxXYWHNorm
+from .geometry import BBoxArrayXYWHNorm, BBoxMapper, BBoxXYWHNorm
 
 
 class Detection(BaseModel):
@@ -152,6 +154,50 @@ class Detection(BaseModel):
 
         return cls(**detection_data)
 
+    @classmethod
+    def from_raw_batch(
+        cls,
+        rows: list[dict],
+        *,
+        upload_w: int | None = None,
+        upload_h: int | None = None,
+        provider: str | None = None,
+    ) -> list["Detection"]:
+        """``from_raw_detection`` over many rows.
+
+        Without a provider or image dimensions there is nothing to map or cross-check,
+        so all rows are validated in one pydantic-core call (a ``ValidationError``
+        names the failing row's index). With a provider and dimensions, when every row
+        carries a 4-value ``bbox``, the boxes go through ``BBoxMapper.get_batch`` in
+        one call and the rows are then validated together. Any other mix goes through
+        ``from_raw_detection`` row by row.
+
+        Args:
+            rows: Raw detection dictionaries
+            upload_w, upload_h: Image dimensions for provider mapping
+            provider: Provider hint for bbox format conversion (e.g., 'gemini_br_xyxy')
+
+        Returns:
+            Detection instances, in row order
+        """
+        if provider is None and (upload_w is None or upload_h is None):
+            return _detection_list_adapter().validate_python(rows)
+        if (
+            provider is not None
+            and upload_w is not None
+            and upload_h is not None
+            and all(len(r.get("bbox") or ()) == 4 for r in rows)
+        ):
+            # Mapped rows skip the bbox cross-check, as in from_raw_detection
+            boxes = BBoxMapper.get_batch(provider)([r["bbox"] for r in rows], upload_w, upload_h)
+            return _detection_list_adapter().validate_python(
+                [{**r, "bbox_norm": box} for r, box in zip(rows, boxes)]
+            )
+        return [
+            cls.from_raw_detection(r, upload_w=upload_w, upload_h=upload_h, provider=provider)
+            for r in rows
+        ]
+
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -166,6 +212,12 @@ class Detection(BaseModel):
     }
 
 
+@lru_cache(maxsize=1)
+def _detection_list_adapter() -> TypeAdapter[list[Detection]]:
+    # Built on first use so importing the module does not pay for the schema build.
+    return TypeAdapter(list[Detection])
+
+
 class TrackStats(BaseModel):
     """Statistical summary of track metrics.
 
@@ -317,18 +369,30 @@ class Track(BaseModel):
         Returns:
             Track instance with computed metrics
         """
-        # Convert raw detections to Detection objects
-        detection_objs = [Detection(**d) for d in detections]
-
-        # Compute frame range
-        frame_numbers = [d.frame_number for d in detection_objs]
-        start_frame = min(frame_numbers)
-        end_frame = max(frame_numbers)
+        # Convert raw detections to Detection objects (validated as one batch)
+        detection_objs = Detection.from_raw_batch(detections)
+
+        if not detection_objs:
+            raise ValueError("Cannot build a track from no detections")
+
+        # Frame range and confidence aggregates in one pass over the detections
+        start_frame = end_frame = detection_objs[0].frame_number
+        conf_min = conf_max = detection_objs[0].confidence
+        confidences: list[float] = []
+        for d in detection_objs:
+            f = d.frame_number
+            if f < start_frame:
+                start_frame = f
+            elif f > end_frame:
+                end_frame = f
+            c = d.confidence
+            if c < conf_min:
+                conf_min = c
+            elif c > conf_max:
+                conf_max = c
+            confidences.append(c)
         duration_frames = end_frame - start_frame + 1
         duration_seconds = duration_frames / fps
-
-        # Compute confidence statistics
-        confidences = [d.confidence for d in detection_objs]
         confidence_mean = sum(confidences) / len(confidences)
 
         # Build stats if not provided
@@ -338,8 +402,8 @@ class Track(BaseModel):
             kwargs["stats"] = TrackStats(
                 confidence_mean=confidence_mean,
                 confidence_std=statistics.stdev(confidences) if len(confidences) > 1 else 0.0,
-                confidence_min=min(confidences),
-                confidence_max=max(confidences),
+                confidence_min=conf_min,
+                confidence_max=conf_max,
             )
 
         # Use mean confidence if not provided
@@ -398,6 +462,35 @@ class Track(BaseModel):
                 return False
         return True
 
+    def to_columns(self) -> dict[str, array | BBoxArrayXYWHNorm]:
+        """Pack the detections into flat per-field columns, in detection order.
+
+        Batched numeric stages (IoU, smoothing, pixel conversion) can scan these
+        contiguous buffers instead of one pydantic object per detection.
+
+        Returns:
+            ``frame_number`` (``array('q')``), ``confidence`` (``array('d')``) and
+            ``bbox_norm`` (``BBoxArrayXYWHNorm``), each with one entry per detection
+
+        Raises:
+            ValueError: If a detection has only a legacy pixel bbox
+        """
+        frames = array("q")
+        confidences = array("d")
+        boxes = array("d")
+        for i, d in enumerate(self.detections):
+            b = d.bbox_norm
+            if b is None:
+                raise ValueError(f"detection {i} has no bbox_norm")
+            frames.append(d.frame_number)
+            confidences.append(d.confidence)
+            boxes.extend((b.x, b.y, b.w, b.h))
+        return {
+            "frame_number": frames,
+            "confidence": confidences,
+            "bbox_norm": BBoxArrayXYWHNorm(boxes),
+        }
+
     @property
     def duration(self) -> float:
         """Alias for duration_seconds for API compatibility.
@@ -8,6 +8,8 @@ Import convenience:
 
     from typus.ops import (
         iou_xyxy,
+        iou_xyxy_batch,
+        iou_matrix,
         area_xyxy,
         intersect_xyxy,
         clamp_xyxy,
@@ -23,7 +25,9 @@ from .bbox import (
     clamp_xyxy,
     from_xywh_px,
     intersect_xyxy,
+    iou_matrix,
     iou_xyxy,
+    iou_xyxy_batch,
     to_xywh_px,
     xywh_to_xyxy,
     xyxy_to_xywh,
@@ -32,6 +36,8 @@ from .tracks import detection_xyxy_px, group_detections_by_frame
 
 __all__ = [
     "iou_xyxy",
+    "iou_xyxy_batch",
+    "iou_matrix",
     "area_xyxy",
     "intersect_xyxy",
     "clamp_xyxy",
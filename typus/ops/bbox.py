@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Tuple
+from typing import List, Sequence, Tuple
 
 from typus.models.geometry import EPS, BBoxXYWHNorm
 
@@ -54,6 +54,56 @@ def iou_xyxy(a: Tuple[float, float, float, float], b: Tuple[float, float, float,
     return inter_area / union
 
 
+def _iou_given_areas(
+    a: Tuple[float, float, float, float],
+    a_area: float,
+    b: Tuple[float, float, float, float],
+    b_area: float,
+) -> float:
+    # Same arithmetic as `iou_xyxy`, with both areas supplied by the caller.
+    iw = min(a[2], b[2]) - max(a[0], b[0])
+    ih = min(a[3], b[3]) - max(a[1], b[1])
+    if iw <= 0.0 or ih <= 0.0:
+        return 0.0
+    inter = iw * ih
+    if inter <= 0.0:
+        return 0.0
+    union = a_area + b_area - inter
+    if union <= 0.0:
+        return 0.0
+    return inter / union
+
+
+def iou_xyxy_batch(
+    a: Sequence[Tuple[float, float, float, float]],
+    b: Sequence[Tuple[float, float, float, float]],
+) -> List[float]:
+    """Element-wise IoU: `out[i] == iou_xyxy(a[i], b[i])`.
+
+    Raises `ValueError` if the sequences differ in length.
+    """
+    if len(a) != len(b):
+        raise ValueError("iou_xyxy_batch: a and b must have the same length")
+    return [_iou_given_areas(x, area_xyxy(x), y, area_xyxy(y)) for x, y in zip(a, b)]
+
+
+def iou_matrix(
+    a: Sequence[Tuple[float, float, float, float]],
+    b: Sequence[Tuple[float, float, float, float]],
+) -> List[List[float]]:
+    """Pairwise IoU for detection matching: `out[i][j] == iou_xyxy(a[i], b[j])`.
+
+    Each box's area is computed once instead of once per pair, and no intersection
+    tuples are built, which is most of the cost of an N×M loop over `iou_xyxy`.
+    """
+    b_areas = [(bb, area_xyxy(bb)) for bb in b]
+    out: List[List[float]] = []
+    for ab in a:
+        a_area = area_xyxy(ab)
+        out.append([_iou_given_areas(ab, a_area, bb, b_area) for bb, b_area in b_areas])
+    return out
+
+
 def clamp_xyxy(
     b: Tuple[float, float, float, float], W: int, H: int
 ) -> Tuple[float, float, float, float]:
@@ -30,7 +30,7 @@ def detection_xyxy_px(det: Detection, W: int, H: int) -> Tuple[float, float, flo
     (pixel `xywh`) is provided, falls back to converting that to `xyxy`.
     """
     if isinstance(det.bbox_norm, BBoxXYWHNorm):
-        return tuple(to_xyxy_px(det.bbox_norm, W, H))
+        return to_xyxy_px(det.bbox_norm, W, H)
 
     if det.bbox and len(det.bbox) == 4:
         x, y, w, h = det.bbox
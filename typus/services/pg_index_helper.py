@@ -38,6 +38,11 @@ DDL_TRGM = [
 ]
 
 
+def index_name_from_ddl(ddl: str) -> str:
+    """Index name from a ``CREATE INDEX IF NOT EXISTS <name> ON ...`` statement."""
+    return ddl.split(" ")[5] if " INDEX IF NOT EXISTS " in ddl else ddl
+
+
 def _major_rank_index_ddls(fqtn: str) -> list[str]:
     levels = [10, 20, 30, 40, 50, 60, 70]
     ddls = []
@@ -95,7 +100,7 @@ async def ensure_expanded_taxa_indexes(
                 errors.append(("extension:pg_trgm", str(e)))
 
         for ddl in ddls:
-            name = ddl.split(" ")[4] if " INDEX IF NOT EXISTS " in ddl else ddl
+            name = index_name_from_ddl(ddl)
             try:
                 await conn.exec_driver_sql(ddl)
                 ensured.append(name)
@@ -24,6 +24,23 @@ DEFAULT_URL = os.getenv(
     "https://assets.polli.ai/expanded_taxa/latest/expanded_taxa.sqlite",
 )
 
+# Spellings of a true ``taxonActive`` flag (Postgres exports ``t``/``f``; Polars may
+# infer a Boolean column, which casts to ``"true"``).
+TAXON_ACTIVE_TRUE = ("t", "T", "true", "True", "TRUE", "1")
+
+# Recommended expanded_taxa indexes; shared with scripts/gen_fixture_sqlite.py.
+EXPANDED_TAXA_INDEXES = (
+    # Fast PK lookups and parent traversals
+    'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_taxon_id ON expanded_taxa("taxonID")',
+    'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_imm_ancestor ON expanded_taxa("immediateAncestor_taxonID")',
+    'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_imm_major_ancestor ON expanded_taxa("immediateMajorAncestor_taxonID")',
+    # Rank filter and ordering aid
+    'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_ranklevel ON expanded_taxa("rankLevel")',
+    # Expression indexes for case-insensitive search
+    'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_lower_name ON expanded_taxa(LOWER("name"))',
+    'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_lower_commonName ON expanded_taxa(LOWER("commonName"))',
+)
+
 
 def _schema_ok(conn: sqlite3.Connection) -> bool:
     cur = conn.execute("PRAGMA table_info('expanded_taxa');")
@@ -38,8 +55,8 @@ def _schema_ok(conn: sqlite3.Connection) -> bool:
     return required.issubset(cols)
 
 
-def _ensure_self_consistent(db: Path) -> None:
-    conn = sqlite3.connect(str(db))
+def _fill_missing_ancestors(conn: sqlite3.Connection) -> None:
+    """Point dangling immediate ancestors at the major ancestor (caller commits)."""
     conn.execute(
         """
         UPDATE expanded_taxa
@@ -49,6 +66,11 @@ def _ensure_self_consistent(db: Path) -> None:
            OR "immediateAncestor_taxonID" NOT IN (SELECT "taxonID" FROM expanded_taxa)
         """
     )
+
+
+def _ensure_self_consistent(db: Path) -> None:
+    conn = sqlite3.connect(str(db))
+    _fill_missing_ancestors(conn)
     conn.commit()
     conn.close()
 
@@ -83,39 +105,79 @@ def _download(url: str, dest: Path) -> Path:
     return dest
 
 
-def _tsv_to_sqlite(tsv_path: Path, sqlite_path: Path, mode: Literal["replace", "append"]):
+def _tsv_to_sqlite(
+    tsv_path: Path,
+    sqlite_path: Path,
+    mode: Literal["replace", "append"],
+    *,
+    fill_missing_ancestors: bool = False,
+):
+    fresh = not sqlite_path.exists()
     conn = sqlite3.connect(str(sqlite_path))
-    if mode == "replace":
-        conn.execute("DROP TABLE IF EXISTS expanded_taxa;")
-    if not _schema_ok(conn):
-        # create schema from header
-        with tsv_path.open("r") as fh:
-            header = fh.readline().rstrip("\n").split("\t")
-        cols = header
-        col_defs = []
-        for c in cols:
-            if (
-                c.endswith("_taxonID")
-                or c.endswith("RankLevel")
-                or c in {"taxonID", "rankLevel", "taxonActive"}
-            ):
-                col_defs.append(f'"{c}" INTEGER')
-            else:
-                col_defs.append(f'"{c}" TEXT')
-        conn.execute(f"CREATE TABLE IF NOT EXISTS expanded_taxa ({', '.join(col_defs)});")
-    # streaming read
-    frame = pl.scan_csv(tsv_path, separator="\t")
-    batch_size = 50000
-    streamed = cast(pl.DataFrame, frame.collect(engine="streaming"))
-    for batch in streamed.iter_slices(n_rows=batch_size):
-        pdf = batch.to_pandas()
-        if "taxonActive" in pdf.columns:
-            pdf["taxonActive"] = pdf["taxonActive"].map(lambda x: 1 if str(x).lower() == "t" else 0)
-        pdf.to_sql(
-            "expanded_taxa", conn, if_exists="append", index=False, method="multi", chunksize=50000
+    try:
+        journal_mode = "delete" if fresh else conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if mode == "replace":
+            conn.execute("DROP TABLE IF EXISTS expanded_taxa;")
+        if not _schema_ok(conn):
+            # create schema from header
+            with tsv_path.open("r") as fh:
+                header = fh.readline().rstrip("\n").split("\t")
+            cols = header
+            col_defs = []
+            for c in cols:
+                if (
+                    c.endswith("_taxonID")
+                    or c.endswith("RankLevel")
+                    or c in {"taxonID", "rankLevel", "taxonActive"}
+                ):
+                    col_defs.append(f'"{c}" INTEGER')
+                else:
+                    col_defs.append(f'"{c}" TEXT')
+            conn.execute(f"CREATE TABLE IF NOT EXISTS expanded_taxa ({', '.join(col_defs)});")
+        # streaming read
+        frame = pl.scan_csv(tsv_path, separator="\t")
+        batch_size = 50000
+        streamed = cast(pl.DataFrame, frame.collect(engine="streaming"))
+        quoted = ", ".join(f'"{c}"' for c in streamed.columns)
+        insert_sql = (
+            f"INSERT INTO expanded_taxa ({quoted}) "
+            f"VALUES ({', '.join('?' for _ in streamed.columns)})"
         )
-    conn.commit()
-    conn.close()
+        if fresh:
+            # Bulk load into a new file: no rollback journal or fsyncs (a failed load
+            # deletes the file, see below), and one transaction of executemany batches.
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+        elif journal_mode != "wal":
+            # Existing data: keep a rollback journal (in memory) so a failed load
+            # leaves the file as it was
+            conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("BEGIN")
+        for batch in streamed.iter_slices(n_rows=batch_size):
+            if "taxonActive" in batch.columns:
+                batch = batch.with_columns(
+                    pl.col("taxonActive")
+                    .cast(pl.String)
+                    .is_in(TAXON_ACTIVE_TRUE)
+                    .fill_null(False)
+                    .cast(pl.Int64)
+                )
+            conn.executemany(insert_sql, batch.rows())
+        if fill_missing_ancestors:
+            # Same transaction as the insert: no reopen or second commit
+            _fill_missing_ancestors(conn)
+        conn.commit()
+        # Leave the file in its previous (for a new file, SQLite's default) journal mode
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    except BaseException:
+        if fresh:
+            # Unjournaled, the schema may already be committed: drop the half-built file
+            # so a later if_exists="fail" cannot mistake it for a good database
+            conn.close()
+            sqlite_path.unlink(missing_ok=True)
+        raise
+    finally:
+        conn.close()
 
 
 def _create_indexes(sqlite_path: Path) -> None:
@@ -127,27 +189,8 @@ def _create_indexes(sqlite_path: Path) -> None:
     conn = sqlite3.connect(str(sqlite_path))
     try:
         cur = conn.cursor()
-        # Fast PK lookups and parent traversals
-        cur.execute(
-            'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_taxon_id ON expanded_taxa("taxonID")'
-        )
-        cur.execute(
-            'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_imm_ancestor ON expanded_taxa("immediateAncestor_taxonID")'
-        )
-        cur.execute(
-            'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_imm_major_ancestor ON expanded_taxa("immediateMajorAncestor_taxonID")'
-        )
-        # Rank filter and ordering aid
-        cur.execute(
-            'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_ranklevel ON expanded_taxa("rankLevel")'
-        )
-        # Expression indexes for case-insensitive search
-        cur.execute(
-            'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_lower_name ON expanded_taxa(LOWER("name"))'
-        )
-        cur.execute(
-            'CREATE INDEX IF NOT EXISTS idx_expanded_taxa_lower_commonName ON expanded_taxa(LOWER("commonName"))'
-        )
+        for ddl in EXPANDED_TAXA_INDEXES:
+            cur.execute(ddl)
         # Gather statistics to help the planner
         cur.execute("ANALYZE")
         conn.commit()
@@ -155,6 +198,28 @@ def _create_indexes(sqlite_path: Path) -> None:
         conn.close()
 
 
+def _finalize(sqlite_path: Path, *, create_indexes: bool) -> None:
+    """Shared index step for the TSV, TSV-fallback and cached-download paths."""
+    if create_indexes:
+        # Only create indexes if this looks like a valid expanded_taxa database
+        try:
+            conn = sqlite3.connect(str(sqlite_path))
+            ok = _schema_ok(conn)
+            conn.close()
+        except Exception:
+            ok = False
+        if ok:
+            _create_indexes(sqlite_path)
+        # If not ok, silently skip (e.g., cache hit test writes a dummy file)
+    else:
+        import warnings as _warnings
+
+        _warnings.warn(
+            "SQLite indexes were not created. Expect slower name search and ancestry operations.",
+            stacklevel=1,
+        )
+
+
 def load_expanded_taxa(
     sqlite_path: Path,
     tsv_path: Path | None = None,
@@ -165,6 +230,12 @@ def load_expanded_taxa(
     force_self_consistent: bool = False,
     create_indexes: bool = True,
 ) -> Path:
+    """Build or fetch the expanded_taxa SQLite database at ``sqlite_path``.
+
+    ``force_self_consistent`` points immediate ancestors that are missing from the
+    table at the major ancestor: inside the load transaction for TSV loads, or in
+    one pass over a downloaded file.
+    """
     if cache_dir is None:
         cache_dir = Path(os.getenv("TYPUS_CACHE_DIR", Path.home() / ".cache" / "typus"))
     if sqlite_path.exists():
@@ -188,27 +259,10 @@ def load_expanded_taxa(
         else:
             load_mode = "replace"
 
-        _tsv_to_sqlite(tsv_path, sqlite_path, load_mode)
-        if force_self_consistent:
-            _ensure_self_consistent(sqlite_path)
-        if create_indexes:
-            # Only create indexes if this looks like a valid expanded_taxa database
-            try:
-                conn = sqlite3.connect(str(sqlite_path))
-                ok = _schema_ok(conn)
-                conn.close()
-            except Exception:
-                ok = False
-            if ok:
-                _create_indexes(sqlite_path)
-            # If not ok, silently skip (e.g., cache hit test writes a dummy file)
-        else:
-            import warnings as _warnings
-
-            _warnings.warn(
-                "SQLite indexes were not created. Expect slower name search and ancestry operations.",
-                stacklevel=1,
-            )
+        _tsv_to_sqlite(
+            tsv_path, sqlite_path, load_mode, fill_missing_ancestors=force_self_consistent
+        )
+        _finalize(sqlite_path, create_indexes=create_indexes)
         return sqlite_path
     # download
     file_name = Path(url).name
@@ -224,45 +278,16 @@ def load_expanded_taxa(
             with gzip.open(gz_path, "rb") as r, (cache_dir / "expanded_taxa.tsv").open("wb") as w:
                 w.write(r.read())
             tsv_path = cache_dir / "expanded_taxa.tsv"
-            _tsv_to_sqlite(tsv_path, sqlite_path, "replace")
-            if force_self_consistent:
-                _ensure_self_consistent(sqlite_path)
-            if create_indexes:
-                try:
-                    conn = sqlite3.connect(str(sqlite_path))
-                    ok = _schema_ok(conn)
-                    conn.close()
-                except Exception:
-                    ok = False
-                if ok:
-                    _create_indexes(sqlite_path)
-            else:
-                import warnings as _warnings
-
-                _warnings.warn(
-                    "SQLite indexes were not created. Expect slower name search and ancestry operations.",
-                    stacklevel=1,
-                )
+            _tsv_to_sqlite(
+                tsv_path, sqlite_path, "replace", fill_missing_ancestors=force_self_consistent
+            )
+            _finalize(sqlite_path, create_indexes=create_indexes)
             return sqlite_path
     sqlite_path.write_bytes(cached.read_bytes())
     if force_self_consistent:
+        # A downloaded file has no load transaction to join, so fill in a pass of its own
         _ensure_self_consistent(sqlite_path)
-    if create_indexes:
-        try:
-            conn = sqlite3.connect(str(sqlite_path))
-            ok = _schema_ok(conn)
-            conn.close()
-        except Exception:
-            ok = False
-        if ok:
-            _create_indexes(sqlite_path)
-    else:
-        import warnings as _warnings
-
-        _warnings.warn(
-            "SQLite indexes were not created. Expect slower name search and ancestry operations.",
-            stacklevel=1,
-        )
+    _finalize(sqlite_path, create_indexes=create_indexes)
     return sqlite_path
 
 
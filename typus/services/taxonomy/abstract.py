@@ -6,7 +6,7 @@ Shared contract for Postgres and SQLite taxonomy backends.
 from __future__ import annotations
 
 import abc
-from typing import List, Set, Tuple
+from typing import Iterable, List, Set, Tuple
 
 from ...constants import RankLevel
 from ...models.summary import TaxonSummary
@@ -63,6 +63,21 @@ class AbstractTaxonomyService(abc.ABC):
             out[i] = await self.get_taxon(i)
         return out
 
+    # Many distances at once (default naive backstop; backends may share one fetch)
+    async def distance_many(
+        self,
+        pairs: Iterable[Tuple[int, int]],
+        *,
+        include_minor_ranks: bool = False,
+        inclusive: bool = False,
+    ) -> dict[Tuple[int, int], int]:
+        out: dict[Tuple[int, int], int] = {}
+        for a, b in pairs:
+            out[(a, b)] = await self.distance(
+                a, b, include_minor_ranks=include_minor_ranks, inclusive=inclusive
+            )
+        return out
+
     # Ancestors helper
     @abc.abstractmethod
     async def ancestors(self, taxon_id: int, *, include_minor_ranks: bool = True) -> List[int]: ...
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping, Set
-from typing import Any
+from collections import OrderedDict
+from collections.abc import KeysView, Mapping, Sequence, Set
+from typing import Any, Generic, TypeVar
 
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
-from ...constants import RankLevel, is_major
+from ...constants import MAJOR_LEVELS, RankLevel
 from ...models.taxon import Taxon
 
+K = TypeVar("K")
+V = TypeVar("V")
+
 
 def col_prefix_for_level(level: RankLevel) -> str:
     if level.value == 335:
@@ -19,31 +23,48 @@ def col_prefix_for_level(level: RankLevel) -> str:
     return f"L{int(level.value)}"
 
 
+# Rank order and per-rank column names, resolved once instead of per row.
+TAXONID_COLUMNS_DESC: tuple[tuple[RankLevel, str], ...] = tuple(
+    (lvl, f"{col_prefix_for_level(lvl)}_taxonID")
+    for lvl in sorted(RankLevel, key=lambda r: int(r.value), reverse=True)
+)
+# level -> (name column, commonName column)
+NAME_COLUMNS: dict[RankLevel, tuple[str, str]] = {
+    lvl: (f"{col_prefix_for_level(lvl)}_name", f"{col_prefix_for_level(lvl)}_commonName")
+    for lvl in RankLevel
+}
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Exclusive upper bound of the half-open range holding every string starting with ``prefix``.
+
+    ``prefix <= s < prefix_upper_bound(prefix)`` under binary (code point) ordering,
+    e.g. ``'apis me' -> 'apis mf'``.
+    """
+    i = len(prefix)
+    while i and ord(prefix[i - 1]) == 0x10FFFF:
+        i -= 1
+    if not i:
+        raise ValueError("prefix has no finite upper bound")
+    return prefix[: i - 1] + chr(ord(prefix[i - 1]) + 1)
+
+
 def ancestry_pairs_from_mapping(row: Mapping[str, Any]) -> list[tuple[int, RankLevel]]:
     """Return ancestry as (taxon_id, rank_level) pairs in root->self order."""
-    pairs: list[tuple[int, RankLevel]] = []
-    levels_desc = sorted([lvl for lvl in RankLevel], key=lambda r: int(r.value), reverse=True)
-    for lvl in levels_desc:
-        prefix = col_prefix_for_level(lvl)
-        col = f"{prefix}_taxonID"
+    # Insertion-ordered dict keyed by taxon id: built already unique, first rank wins.
+    pairs: dict[int, RankLevel] = {}
+    for lvl, col in TAXONID_COLUMNS_DESC:
         val = row.get(col)
         if val is not None:
-            pairs.append((int(val), lvl))
+            pairs.setdefault(int(val), lvl)
 
     self_tid = row.get("taxonID") or row.get("taxon_id")
     self_rank = row.get("rankLevel") or row.get("rank_level")
     if self_tid is None or self_rank is None:
         raise KeyError("Row mapping is missing taxonID/rankLevel fields")
 
-    pairs.append((int(self_tid), RankLevel(int(self_rank))))
-
-    seen: set[int] = set()
-    out: list[tuple[int, RankLevel]] = []
-    for tid, lvl in pairs:
-        if tid not in seen:
-            out.append((tid, lvl))
-            seen.add(tid)
-    return out
+    pairs.setdefault(int(self_tid), RankLevel(int(self_rank)))
+    return list(pairs.items())
 
 
 def filtered_ancestry_ids(row: Mapping[str, Any], include_minor_ranks: bool) -> list[int]:
@@ -51,7 +72,89 @@ def filtered_ancestry_ids(row: Mapping[str, Any], include_minor_ranks: bool) ->
     if not has_expanded:
         return []
     pairs = ancestry_pairs_from_mapping(row)
-    return [tid for tid, lvl in pairs if include_minor_ranks or is_major(lvl)]
+    if include_minor_ranks:
+        return [tid for tid, _lvl in pairs]
+    # RankLevel is an IntEnum, so membership hashes as a plain int; skip the call
+    return [tid for tid, lvl in pairs if lvl in MAJOR_LEVELS]
+
+
+def deepest_shared_ancestor(paths: Sequence[Sequence[int]]) -> int | None:
+    """Deepest id present in every root->self path, or ``None`` if none is shared.
+
+    Paths from one tree agree up to the LCA and diverge after it, so walk them in
+    lockstep (one ``zip`` column per depth) and stop at the first disagreement;
+    no sets or masks are built.
+    """
+    if not paths:
+        return None
+    depth = 0
+    for column in zip(*paths):
+        if column.count(column[0]) != len(column):
+            break
+        depth += 1
+    return paths[0][depth - 1] if depth else None
+
+
+# Per-service memo bounds; long-lived processes would otherwise grow without limit
+LCA_CACHE_MAXSIZE = 100_000
+# Cached ancestry costs about 1 KB per taxon, so this caps it near 100 MB
+ANCESTRY_CACHE_MAXSIZE = 100_000
+
+
+class LRUCache(Generic[K, V]):
+    """Mapping that keeps at most ``maxsize`` entries, evicting the least recently used.
+
+    ``get`` and assignment mark an entry as used; ``[]`` reads and ``in`` do not.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __getitem__(self, key: K) -> V:
+        return self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def keys(self) -> KeysView[K]:
+        return self._data.keys()
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+def _match_candidates(
+    scientific_name: str | None, vernacular_name: str | None, scopes: Set[str]
+) -> list[str]:
+    """Lowercased names a query is scored against; falls back outside ``scopes``."""
+    candidates: list[str] = []
+    if "scientific" in scopes and scientific_name:
+        candidates.append(scientific_name.strip())
+    if "vernacular" in scopes and vernacular_name:
+        candidates.append(vernacular_name.strip())
+
+    if not candidates:
+        fallback = scientific_name or vernacular_name
+        if not fallback:
+            return []
+        candidates = [fallback.strip()]
+    return [c.lower() for c in candidates]
 
 
 def score_taxon_match(
@@ -65,20 +168,32 @@ def score_taxon_match(
     q_norm = query.strip().lower()
     if not q_norm:
         return 0.0
+    candidates = _match_candidates(scientific_name, vernacular_name, scopes)
+    if not candidates:
+        return 0.0
+    return max(float(fuzz.WRatio(q_norm, candidate) / 100.0) for candidate in candidates)
 
-    candidates: list[str] = []
-    if "scientific" in scopes and scientific_name:
-        candidates.append(scientific_name.strip())
-    if "vernacular" in scopes and vernacular_name:
-        candidates.append(vernacular_name.strip())
 
-    if not candidates:
-        fallback = scientific_name or vernacular_name
-        if not fallback:
-            return 0.0
-        candidates = [fallback.strip()]
+def score_search_rows(
+    query: str, rows: Sequence[Mapping[str, Any]], *, scopes: Set[str]
+) -> list[float]:
+    """Best ``score_taxon_match`` score for each search row, in one batched call.
 
-    return max(float(fuzz.WRatio(q_norm, candidate.lower()) / 100.0) for candidate in candidates)
+    All rows' candidate names go through a single ``process.extract`` so the WRatio
+    loop runs inside RapidFuzz rather than one Python-level call per name.
+    """
+    scores = [0.0] * len(rows)
+    q_norm = query.strip().lower()
+    if not q_norm:
+        return scores
+    choices: dict[tuple[int, int], str] = {}
+    for i, row in enumerate(rows):
+        names = _match_candidates(row.get("name"), row.get("commonName"), scopes)
+        for j, name in enumerate(names):
+            choices[(i, j)] = name
+    for _name, score, (i, _j) in process.extract(q_norm, choices, scorer=fuzz.WRatio, limit=None):
+        scores[i] = max(scores[i], float(score) / 100.0)
+    return scores
 
 
 def taxon_from_search_row(
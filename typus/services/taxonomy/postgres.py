@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import List, Sequence, Set, Tuple
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Set, Tuple
 
-from sqlalchemy import select, text
+from sqlalchemy import TextClause, bindparam, select, text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
 from ...constants import RankLevel, is_major
@@ -15,16 +16,85 @@ from ...models.taxon import Taxon
 from ...orm.expanded_taxa import ExpandedTaxa
 from .abstract import AbstractTaxonomyService
 from .common import (
+    ANCESTRY_CACHE_MAXSIZE,
+    LCA_CACHE_MAXSIZE,
+    NAME_COLUMNS,
+    LRUCache,
     ancestry_pairs_from_mapping,
-    col_prefix_for_level,
+    deepest_shared_ancestor,
     filtered_ancestry_ids,
-    score_taxon_match,
+    prefix_upper_bound,
+    score_search_rows,
     taxon_from_search_row,
 )
 from .errors import BackendConnectionError, TaxonNotFoundError
 
 logger = logging.getLogger(__name__)
 
+# (ancestry with minor ranks, major ranks only), root→self
+_Ancestry = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+# Full rows for a batch of ids; ancestry comes from the expanded L*_taxonID columns.
+_ANCESTRY_ROWS_SQL = text('SELECT * FROM expanded_taxa WHERE "taxonID" IN :ids').bindparams(
+    bindparam("ids", expanding=True)
+)
+
+# Compiled once; the ids are an expanding bind so the SQL text (and any
+# server-side prepared statement) is shared across calls of the same arity.
+_LCA_RECURSIVE_SQL = text(
+    """
+    WITH RECURSIVE taxon_ancestors (query_taxon_id, taxon_id, parent_id, lvl) AS (
+        SELECT "taxonID", "taxonID", "immediateAncestor_taxonID", 0
+        FROM expanded_taxa
+        WHERE "taxonID" IN :ids
+        UNION ALL
+        SELECT ta.query_taxon_id, et."taxonID", et."immediateAncestor_taxonID", ta.lvl + 1
+        FROM expanded_taxa et
+        JOIN taxon_ancestors ta ON et."taxonID" = ta.parent_id
+        WHERE ta.parent_id IS NOT NULL
+    )
+    SELECT taxon_id
+    FROM taxon_ancestors
+    GROUP BY taxon_id
+    HAVING COUNT(DISTINCT query_taxon_id) = :n
+    ORDER BY MAX(lvl) ASC
+    LIMIT 1
+    """
+).bindparams(bindparam("ids", expanding=True))
+
+
+@lru_cache(maxsize=32)
+def _search_stmt(cols: tuple[str, ...], mode: str, rank_filtered: bool) -> TextClause | None:
+    """Statement for one search shape, built once; ``None`` for an unknown mode.
+
+    The query, rank levels and LIMIT are bind parameters, so a shape always sends the
+    same SQL text and hits SQLAlchemy's compiled cache and asyncpg's per-connection
+    prepared statements, whatever the rank filter holds.
+    """
+    if mode == "exact":
+        preds = [f"LOWER({c}) = :q" for c in cols]
+    elif mode == "prefix":
+        # Half-open range with the pattern operators: the query is taken literally
+        # (no LIKE wildcards) and the lower(..) text_pattern_ops indexes serve it on
+        # any PG version, even from a generic prepared-statement plan.
+        preds = [f"(LOWER({c}) ~>=~ :q AND LOWER({c}) ~<~ :q_hi)" for c in cols]
+    elif mode == "substring":
+        # '%q%' never uses a btree; the lower(..) gin_trgm_ops indexes from
+        # typus-pg-ensure-indexes turn this into a bitmap index scan.
+        preds = [f"LOWER({c}) LIKE :q" for c in cols]
+    else:
+        return None
+    if not preds:
+        return None
+    sql = (
+        'SELECT DISTINCT "taxonID", "name", "rankLevel", "immediateAncestor_taxonID", "commonName" '
+        "FROM expanded_taxa "
+        f'WHERE ({" OR ".join(preds)}) AND COALESCE("taxonActive", TRUE)'
+    )
+    if rank_filtered:
+        sql += ' AND "rankLevel" = ANY(:levels)'
+    return text(sql + ' ORDER BY "rankLevel" ASC, "name" ASC LIMIT :lim')
+
 
 class _ChildrenCursor:
     """Lazy children result that supports both ``await`` and ``async for``."""
@@ -76,14 +146,61 @@ class _ChildrenCursor:
 class PostgresTaxonomyService(AbstractTaxonomyService):
     """Async service backed by `expanded_taxa` materialised view."""
 
-    def __init__(self, dsn: str):
-        # Use NullPool to avoid reusing connections across pytest event loops,
-        # which can cause "Future attached to a different loop" with asyncpg.
-        self._engine = create_async_engine(dsn, pool_pre_ping=True, poolclass=NullPool)
+    def __init__(self, dsn: str | AsyncEngine):
+        """Connect via ``dsn``, or share an existing engine (and its pool).
+
+        A passed-in engine stays owned by the caller and is not disposed by ``aclose``.
+        """
+        if isinstance(dsn, str):
+            # Use NullPool to avoid reusing connections across pytest event loops,
+            # which can cause "Future attached to a different loop" with asyncpg.
+            self._engine = create_async_engine(dsn, pool_pre_ping=True, poolclass=NullPool)
+            self._own_engine = True
+        else:
+            self._engine = dsn
+            self._own_engine = False
         self._Session = async_sessionmaker(self._engine, expire_on_commit=False)
+        # taxonID -> ancestry, for ids touched by lca/distance/ancestors
+        self._ancestry_cache: LRUCache[int, _Ancestry] = LRUCache(ANCESTRY_CACHE_MAXSIZE)
+        # (taxon id set, include_minor_ranks) -> LCA taxonID
+        self._lca_cache: LRUCache[tuple[frozenset[int], bool], int] = LRUCache(LCA_CACHE_MAXSIZE)
 
     async def aclose(self) -> None:
-        await self._engine.dispose()
+        self._ancestry_cache.clear()
+        self._lca_cache.clear()
+        if self._own_engine:
+            await self._engine.dispose()
+
+    async def _ancestries(self, taxon_ids: set[int]) -> dict[int, _Ancestry]:
+        """Ancestry for ``taxon_ids``, the uncached ones fetched in one query; unknown ids are absent.
+
+        Callers read the returned dict rather than the cache, which may already have
+        evicted part of a batch larger than its bound.
+        """
+        found: dict[int, _Ancestry] = {}
+        for tid in taxon_ids:
+            hit = self._ancestry_cache.get(tid)
+            if hit is not None:
+                found[tid] = hit
+        missing = taxon_ids - found.keys()
+        if not missing:
+            return found
+        try:
+            async with self._Session() as s:
+                res = await s.execute(_ANCESTRY_ROWS_SQL, {"ids": list(missing)})
+                rows = res.mappings().all()
+        except SQLAlchemyError as exc:
+            raise BackendConnectionError(
+                f"Failed to fetch ancestry from Postgres backend: {exc}"
+            ) from exc
+        for row in rows:
+            row_dict = dict(row)
+            tid = int(row_dict["taxonID"])
+            found[tid] = self._ancestry_cache[tid] = (
+                tuple(filtered_ancestry_ids(row_dict, True)),
+                tuple(filtered_ancestry_ids(row_dict, False)),
+            )
+        return found
 
     async def __aenter__(self) -> "PostgresTaxonomyService":
         return self
@@ -154,35 +271,20 @@ class PostgresTaxonomyService(AbstractTaxonomyService):
 
         return None
 
+    async def _lca_from_cached_ancestry(self, taxon_ids: set[int]) -> int | None:
+        """Deepest ancestor (any rank) shared by every id, from the ancestry cache.
+
+        Answers what ``_lca_recursive_fallback`` computes without walking the parent
+        chain in SQL; ``None`` when an id is unknown or nothing is shared.
+        """
+        found = await self._ancestries(taxon_ids)
+        if len(found) != len(taxon_ids):
+            return None
+        return deepest_shared_ancestor([found[tid][0] for tid in taxon_ids])
+
     async def _lca_recursive_fallback(self, s, taxon_ids: set[int]) -> int | None:
         """LCA implementation using recursive CTE for all ranks."""
-        anchor_parts = []
-        for tid in taxon_ids:
-            anchor_parts.append(
-                'SELECT {tid} AS query_taxon_id, "taxonID" as taxon_id, "immediateAncestor_taxonID" AS parent_id, 0 AS lvl FROM expanded_taxa WHERE "taxonID" = {tid}'.format(
-                    tid=tid
-                )
-            )
-        anchor_sql = " UNION ALL ".join(anchor_parts)
-
-        recursive_sql = f"""
-            WITH RECURSIVE taxon_ancestors (query_taxon_id, taxon_id, parent_id, lvl) AS (
-                {anchor_sql}
-                UNION ALL
-                SELECT ta.query_taxon_id, et."taxonID" as taxon_id, et."immediateAncestor_taxonID", ta.lvl + 1
-                FROM expanded_taxa et
-                JOIN taxon_ancestors ta ON et."taxonID" = ta.parent_id
-                WHERE ta.parent_id IS NOT NULL
-            )
-            SELECT taxon_id
-            FROM taxon_ancestors
-            GROUP BY taxon_id
-            HAVING COUNT(DISTINCT query_taxon_id) = {len(taxon_ids)}
-            ORDER BY MAX(lvl) DESC
-            LIMIT 1
-        """
-        lca_tid = await s.scalar(text(recursive_sql))
-        return lca_tid
+        return await s.scalar(_LCA_RECURSIVE_SQL, {"ids": list(taxon_ids), "n": len(taxon_ids)})
 
     async def lca(self, taxon_ids: set[int], *, include_minor_ranks: bool = False) -> Taxon:
         if not taxon_ids:
@@ -190,11 +292,23 @@ class PostgresTaxonomyService(AbstractTaxonomyService):
         if len(taxon_ids) == 1:
             return await self.get_taxon(list(taxon_ids)[0])
 
+        # Memoized by id set, so argument order and repeat pairs share one computation
+        key = (frozenset(taxon_ids), include_minor_ranks)
+        lca_tid = self._lca_cache.get(key)
+        if lca_tid is None:
+            lca_tid = await self._lca_id(taxon_ids, include_minor_ranks)
+            self._lca_cache[key] = lca_tid
+        return await self.get_taxon(lca_tid)
+
+    async def _lca_id(self, taxon_ids: set[int], include_minor_ranks: bool) -> int:
         if not include_minor_ranks:
             try:
                 async with self._Session() as s:
                     lca_tid = await self._lca_via_expanded_columns(s, taxon_ids)
-                    if lca_tid is None:
+                if lca_tid is None:
+                    lca_tid = await self._lca_from_cached_ancestry(taxon_ids)
+                if lca_tid is None:
+                    async with self._Session() as s:
                         lca_tid = await self._lca_recursive_fallback(s, taxon_ids)
             except SQLAlchemyError as exc:
                 raise BackendConnectionError(
@@ -203,21 +317,16 @@ class PostgresTaxonomyService(AbstractTaxonomyService):
 
             if lca_tid is None:
                 raise ValueError(f"Could not determine LCA for taxon IDs: {taxon_ids}")
-            return await self.get_taxon(int(lca_tid))
-
-        ancestries = [await self.ancestors(tid, include_minor_ranks=True) for tid in taxon_ids]
-        common_prefix = ancestries[0]
-        for anc in ancestries[1:]:
-            current: list[int] = []
-            for a, b in zip(common_prefix, anc):
-                if a == b:
-                    current.append(a)
-                else:
-                    break
-            common_prefix = current
-        if not common_prefix:
+            return int(lca_tid)
+
+        found = await self._ancestries(taxon_ids)
+        for tid in taxon_ids:
+            if tid not in found:
+                raise TaxonNotFoundError(tid)
+        lca_tid = deepest_shared_ancestor([found[tid][0] for tid in taxon_ids])
+        if lca_tid is None:
             raise ValueError(f"Could not determine LCA for taxon IDs: {taxon_ids}")
-        return await self.get_taxon(common_prefix[-1])
+        return lca_tid
 
     async def distance(
         self,
@@ -229,19 +338,44 @@ class PostgresTaxonomyService(AbstractTaxonomyService):
     ) -> int:
         if a == b:
             return 0
+        res = await self.distance_many(
+            [(a, b)], include_minor_ranks=include_minor_ranks, inclusive=inclusive
+        )
+        return res[(a, b)]
 
-        anc_a = await self.ancestors(a, include_minor_ranks=include_minor_ranks)
-        anc_b = await self.ancestors(b, include_minor_ranks=include_minor_ranks)
-
-        i = 0
-        while i < len(anc_a) and i < len(anc_b) and anc_a[i] == anc_b[i]:
-            i += 1
-        dist_a = len(anc_a) - i
-        dist_b = len(anc_b) - i
-        distance = dist_a + dist_b
-        if inclusive:
-            distance += 1
-        return distance
+    async def distance_many(
+        self,
+        pairs: Iterable[Tuple[int, int]],
+        *,
+        include_minor_ranks: bool = False,
+        inclusive: bool = False,
+    ) -> dict[Tuple[int, int], int]:
+        """``distance`` for every pair, with all missing ancestry fetched in one query."""
+        pairs = list(pairs)
+        found = await self._ancestries({tid for pair in pairs for tid in pair})
+        # Read the cached tuples in place; a path's length is the taxon's depth
+        which = 0 if include_minor_ranks else 1
+        out: dict[Tuple[int, int], int] = {}
+        for a, b in pairs:
+            if a == b:
+                out[(a, b)] = 0
+                continue
+            for tid in (a, b):
+                if tid not in found:
+                    raise TaxonNotFoundError(tid)
+            anc_a = found[a][which]
+            anc_b = found[b][which]
+
+            shared = 0
+            for x, y in zip(anc_a, anc_b):
+                if x != y:
+                    break
+                shared += 1
+            distance = len(anc_a) + len(anc_b) - 2 * shared
+            if inclusive:
+                distance += 1
+            out[(a, b)] = distance
+        return out
 
     async def _distance_to_ancestor(
         self, descendant: int, ancestor: int, include_minor_ranks: bool
@@ -330,26 +464,14 @@ class PostgresTaxonomyService(AbstractTaxonomyService):
         )
 
     async def ancestors(self, taxon_id: int, *, include_minor_ranks: bool = True) -> list[int]:
-        """Return ancestry IDs root→self using expanded columns (works without ancestor rows)."""
-        # Select explicitly to avoid optional columns like `path` if absent.
-        sql = text(
-            """
-            SELECT * FROM expanded_taxa
-            WHERE "taxonID" = :tid
-            """
-        )
-        try:
-            async with self._Session() as s:
-                res = await s.execute(sql, {"tid": taxon_id})
-                row = res.mappings().first()
-        except SQLAlchemyError as exc:
-            raise BackendConnectionError(
-                f"Failed to fetch ancestry from Postgres backend: {exc}"
-            ) from exc
-        if row is None:
-            raise TaxonNotFoundError(taxon_id)
+        """Return ancestry IDs root→self using expanded columns (works without ancestor rows).
 
-        return filtered_ancestry_ids(dict(row), include_minor_ranks)
+        Ancestry is cached per service instance (bounded LRU, cleared by ``aclose``).
+        """
+        cached = (await self._ancestries({taxon_id})).get(taxon_id)
+        if cached is None:
+            raise TaxonNotFoundError(taxon_id)
+        return list(cached[0] if include_minor_ranks else cached[1])
 
     async def taxon_summary(
         self,
@@ -379,9 +501,7 @@ class PostgresTaxonomyService(AbstractTaxonomyService):
             if major_ranks_only and tid != taxon_id and not is_major(lvl):
                 continue
 
-            prefix = col_prefix_for_level(lvl)
-            name_col = f"{prefix}_name"
-            common_col = f"{prefix}_commonName"
+            name_col, common_col = NAME_COLUMNS[lvl]
 
             scientific_name = row_dict.get(name_col)
             vernacular_name = row_dict.get(common_col)
@@ -441,57 +561,28 @@ class PostgresTaxonomyService(AbstractTaxonomyService):
         if "vernacular" in scopes:
             cols.append('"commonName"')
 
-        def make_predicates(mode: str) -> tuple[str, dict]:
-            where_clauses: list[str] = []
-            params: dict[str, str] = {}
-            idx = 0
-
-            ql = q_norm.lower()
-            if mode == "exact":
-                for c in cols:
-                    k = f"q{idx}"
-                    idx += 1
-                    where_clauses.append(f"LOWER({c}) = :{k}")
-                    params[k] = ql
-            elif mode == "prefix":
-                for c in cols:
-                    k = f"q{idx}"
-                    idx += 1
-                    where_clauses.append(f"LOWER({c}) LIKE :{k}")
-                    params[k] = ql + "%"
-            elif mode == "substring":
-                for c in cols:
-                    k = f"q{idx}"
-                    idx += 1
-                    where_clauses.append(f"LOWER({c}) LIKE :{k}")
-                    params[k] = f"%{ql}%"
-            return " OR ".join(where_clauses), params
+        ql = q_norm.lower()
+        query_param = {"exact": ql, "prefix": ql, "substring": f"%{ql}%"}
 
         modes: Sequence[str] = ("exact", "prefix", "substring") if match == "auto" else (match,)
 
-        rank_filter_sql = ""
-        if rank_filter:
-            levels = sorted(int(r.value) for r in rank_filter)
-            placeholders = ",".join(str(v) for v in levels)
-            rank_filter_sql = f' AND "rankLevel" IN ({placeholders})'
+        levels = sorted(int(r.value) for r in rank_filter) if rank_filter else []
+        sup_limit = max(limit * 5, 50) if fuzzy else limit
 
         results_acc: List[Tuple[Taxon, float]] = []
         try:
             async with self._Session() as s:
                 superset_rows: list[dict] = []
                 for mode in modes:
-                    pred_sql, params = make_predicates(mode)
-                    if not pred_sql:
+                    stmt = _search_stmt(tuple(cols), mode, bool(levels))
+                    if stmt is None:
                         continue
-                    sup_limit = max(limit * 5, 50) if fuzzy else limit
-                    base_sql = (
-                        'SELECT DISTINCT "taxonID", "name", "rankLevel", "immediateAncestor_taxonID", "commonName" '
-                        "FROM expanded_taxa "
-                        f'WHERE ({pred_sql}) AND COALESCE("taxonActive", TRUE)'
-                    )
-                    base_sql += rank_filter_sql
-                    base_sql += f' ORDER BY "rankLevel" ASC, "name" ASC LIMIT {sup_limit}'
-                    res = await s.execute(text(base_sql), params)
+                    params = {"q": query_param[mode], "lim": sup_limit}
+                    if mode == "prefix":
+                        params["q_hi"] = prefix_upper_bound(ql)
+                    if levels:
+                        params["levels"] = levels
+                    res = await s.execute(stmt, params)
                     superset_rows = [dict(r) for r in res.mappings().all()]
                     if superset_rows:
                         break
@@ -500,21 +591,16 @@ class PostgresTaxonomyService(AbstractTaxonomyService):
                 f"Failed to execute search against Postgres backend: {exc}"
             ) from exc
 
-        for r in superset_rows:
+        scores = (
+            score_search_rows(q_norm, superset_rows, scopes=scopes)
+            if fuzzy
+            else [1.0] * len(superset_rows)
+        )
+        for r, sc in zip(superset_rows, scores):
             tax = taxon_from_search_row(
                 r,
                 ancestry=[],
             )
-            sc = (
-                score_taxon_match(
-                    q_norm,
-                    scientific_name=r.get("name"),
-                    vernacular_name=r.get("commonName"),
-                    scopes=scopes,
-                )
-                if fuzzy
-                else 1.0
-            )
             if not fuzzy or sc >= threshold:
                 results_acc.append((tax, sc))
 
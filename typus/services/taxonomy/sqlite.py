@@ -1,16 +1,22 @@
 import asyncio
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Set, Tuple
 
-from ...constants import RankLevel, is_major
+from ...constants import MAJOR_LEVELS, RankLevel, is_major
 from ...models.summary import TaxonSummary, TaxonTrailNode
 from ...models.taxon import Taxon
 from .abstract import AbstractTaxonomyService
 from .common import (
+    ANCESTRY_CACHE_MAXSIZE,
+    LCA_CACHE_MAXSIZE,
+    NAME_COLUMNS,
+    LRUCache,
     ancestry_pairs_from_mapping,
-    col_prefix_for_level,
-    score_taxon_match,
+    prefix_upper_bound,
+    score_search_rows,
     taxon_from_search_row,
 )
 from .errors import TaxonNotFoundError
@@ -27,6 +33,36 @@ SELECT tid, tpid FROM subtree_nodes;
 assert "immediateAncestor_taxonID" in _FETCH_SUBTREE_SQL
 
 
+@lru_cache(maxsize=128)
+def _search_sql(cols: tuple[str, ...], mode: str, rank_levels: tuple[int, ...]) -> str:
+    """SQL text for one search shape, built once; "" for an unknown mode.
+
+    The query and LIMIT are bound parameters, so every call with the same shape sends
+    identical text and reuses the connection's compiled statement.
+    """
+    if mode == "exact":
+        preds = [f"LOWER({c}) = ?" for c in cols]
+    elif mode == "prefix":
+        # SQLite never uses an index for LIKE on an expression; a half-open range
+        # on LOWER(col) is a SEARCH on the loader's lower(..) expression indexes.
+        preds = [f"(LOWER({c}) >= ? AND LOWER({c}) < ?)" for c in cols]
+    elif mode == "substring":
+        preds = [f"LOWER({c}) LIKE ?" for c in cols]
+    else:
+        return ""
+    if not preds:
+        return ""
+    sql = (
+        'SELECT DISTINCT "taxonID", "name", "rankLevel", "immediateAncestor_taxonID", "commonName" '
+        "FROM expanded_taxa WHERE ("
+        + " OR ".join(preds)
+        + ") AND (\"taxonActive\" IS NULL OR CAST(\"taxonActive\" AS INTEGER)=1 OR LOWER(CAST(\"taxonActive\" AS TEXT)) IN ('1', 't', 'true'))"
+    )
+    if rank_levels:
+        sql += f' AND "rankLevel" IN ({",".join(str(v) for v in rank_levels)})'
+    return sql + ' ORDER BY "rankLevel" ASC, "name" ASC LIMIT ?'
+
+
 class SQLiteTaxonomyService(AbstractTaxonomyService):
     """
     Implementation of AbstractTaxonomyService backed by SQLite fixture database.
@@ -43,7 +79,7 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         query = f'SELECT "taxonID", "rankLevel" FROM "expanded_taxa" WHERE "taxonID" IN ({",".join("?" * len(ids_to_cache))})'
 
         rows = await loop.run_in_executor(
-            None, lambda: self._conn.execute(query, tuple(ids_to_cache)).fetchall()
+            self._executor, lambda: self._conn.execute(query, tuple(ids_to_cache)).fetchall()
         )
 
         for row in rows:
@@ -51,6 +87,11 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
 
     def __init__(self, path: str | Path | None = None):
         self._rank_cache: dict[int, RankLevel] = {}
+        self._ancestry_pairs_cache: LRUCache[int, tuple[tuple[int, RankLevel], ...]] = LRUCache(
+            ANCESTRY_CACHE_MAXSIZE
+        )
+        # (taxon id set, include_minor_ranks) -> LCA taxonID
+        self._lca_cache: LRUCache[tuple[frozenset[int], bool], int] = LRUCache(LCA_CACHE_MAXSIZE)
         if path is None:
             path = Path(__file__).parent.parent.parent / "tests" / "expanded_taxa_sample.sqlite"
             if not path.exists():
@@ -63,15 +104,23 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
                 from ..sqlite_loader import load_expanded_taxa
 
                 load_expanded_taxa(path, tsv_path=sample_tsv)
+        # One worker thread owns every use of the connection: calls never contend for the
+        # default executor, and the connection is never touched from two threads at once.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="typus-sqlite")
         self._conn = sqlite3.connect(str(path), check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        # Keep index pages resident: memory-map up to 256 MiB, 64 MiB page cache
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute("PRAGMA cache_size=-65536")
 
     def close(self) -> None:
         self._conn.close()
+        self._executor.shutdown(wait=False)
 
     async def aclose(self) -> None:
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self.close)
+        await loop.run_in_executor(self._executor, self._conn.close)
+        self._executor.shutdown(wait=False)
 
     async def __aenter__(self) -> "SQLiteTaxonomyService":
         return self
@@ -83,23 +132,34 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         """Return ancestry (root→self) as (taxon_id, RankLevel) pairs using expanded columns.
 
         Works even if intermediate ancestors are absent as rows in the fixture DB.
+        Cached per service (bounded LRU): the database is a read-only snapshot, so
+        repeated LCA/distance calls over the same taxa skip the row fetch.
         """
-        loop = asyncio.get_running_loop()
-        row = await loop.run_in_executor(
-            None,
-            lambda: self._conn.execute(
-                'SELECT * FROM "expanded_taxa" WHERE "taxonID"=?', (taxon_id,)
-            ).fetchone(),
-        )
-        if row is None:
-            raise TaxonNotFoundError(taxon_id)
-
-        return ancestry_pairs_from_mapping(dict(row))
+        cached = self._ancestry_pairs_cache.get(taxon_id)
+        if cached is None:
+            loop = asyncio.get_running_loop()
+            row = await loop.run_in_executor(
+                self._executor,
+                lambda: self._conn.execute(
+                    'SELECT * FROM "expanded_taxa" WHERE "taxonID"=?', (taxon_id,)
+                ).fetchone(),
+            )
+            if row is None:
+                raise TaxonNotFoundError(taxon_id)
+            cached = self._cache_ancestry_pairs(taxon_id, row)
+        return list(cached)
+
+    def _cache_ancestry_pairs(
+        self, taxon_id: int, row: sqlite3.Row
+    ) -> tuple[tuple[int, RankLevel], ...]:
+        pairs = tuple(ancestry_pairs_from_mapping(dict(row)))
+        self._ancestry_pairs_cache[taxon_id] = pairs
+        return pairs
 
     async def get_taxon(self, taxon_id: int) -> Taxon:
         loop = asyncio.get_running_loop()
         row = await loop.run_in_executor(
-            None,
+            self._executor,
             lambda: self._conn.execute(
                 'SELECT * FROM "expanded_taxa" WHERE "taxonID"=?', (taxon_id,)
             ).fetchone(),
@@ -110,7 +170,9 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         if row["taxonID"] not in self._rank_cache:
             self._rank_cache[row["taxonID"]] = RankLevel(int(row["rankLevel"]))
 
-        pairs = await self._expanded_ancestry_pairs(int(row["taxonID"]))
+        # Ancestry comes from the row already in hand rather than a second fetch
+        row_tid = int(row["taxonID"])
+        pairs = self._ancestry_pairs_cache.get(row_tid) or self._cache_ancestry_pairs(row_tid, row)
         ancestry_path = [tid for (tid, _lvl) in pairs]
 
         return Taxon(
@@ -135,7 +197,7 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         SELECT tid FROM sub WHERE lvl > 0;
         """
         child_ids_tuples = await loop.run_in_executor(
-            None, lambda: self._conn.execute(query, (taxon_id, depth)).fetchall()
+            self._executor, lambda: self._conn.execute(query, (taxon_id, depth)).fetchall()
         )
         child_taxa = [
             await self.get_taxon(child_id_tuple[0]) for child_id_tuple in child_ids_tuples
@@ -150,7 +212,7 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         pairs = await self._expanded_ancestry_pairs(taxon_id)
         if include_minor_ranks:
             return [tid for (tid, _lvl) in pairs]
-        return [tid for (tid, lvl) in pairs if is_major(lvl)]
+        return [tid for (tid, lvl) in pairs if lvl in MAJOR_LEVELS]
 
     async def lca(self, taxon_ids: set[int], *, include_minor_ranks: bool = False) -> Taxon:
         """Compute lowest common ancestor using efficient algorithms.
@@ -163,6 +225,16 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         if len(taxon_ids) == 1:
             return await self.get_taxon(list(taxon_ids)[0])
 
+        # Memoized by id set, so argument order and repeat pairs share one computation
+        key = (frozenset(taxon_ids), include_minor_ranks)
+        cached = self._lca_cache.get(key)
+        if cached is not None:
+            return await self.get_taxon(cached)
+        taxon = await self._lca_uncached(taxon_ids, include_minor_ranks)
+        self._lca_cache[key] = taxon.taxon_id
+        return taxon
+
+    async def _lca_uncached(self, taxon_ids: set[int], include_minor_ranks: bool) -> Taxon:
         loop = asyncio.get_running_loop()
 
         if not include_minor_ranks:
@@ -180,7 +252,7 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
                 WHERE "taxonID" IN ({placeholders})
             """
             rows = await loop.run_in_executor(
-                None,
+                self._executor,
                 lambda: self._conn.execute(sql, taxon_list).fetchall(),
             )
 
@@ -297,7 +369,7 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         """
 
         result = await loop.run_in_executor(
-            None,
+            self._executor,
             lambda: self._conn.execute(sql, (descendant, ancestor)).fetchone(),
         )
 
@@ -313,7 +385,7 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         query = _FETCH_SUBTREE_SQL.format(placeholders)
 
         rows = await loop.run_in_executor(
-            None, lambda: self._conn.execute(query, tuple(root_ids)).fetchall()
+            self._executor, lambda: self._conn.execute(query, tuple(root_ids)).fetchall()
         )
 
         return {row["tid"]: row["tpid"] for row in rows}
@@ -347,74 +419,45 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         if "vernacular" in scopes:
             cols.append('"commonName"')
 
-        def make_predicates(mode: str) -> str:
-            if mode == "exact":
-                return " OR " + (" OR ".join([f"LOWER({c}) = ?" for c in cols]))
-            elif mode == "prefix":
-                return " OR " + (" OR ".join([f"LOWER({c}) LIKE ?" for c in cols]))
-            elif mode == "substring":
-                return " OR " + (" OR ".join([f"LOWER({c}) LIKE ?" for c in cols]))
-            return ""
-
         def build_params(mode: str) -> List[str]:
             ql = q_norm.lower()
             if mode == "exact":
                 return [ql for _ in cols]
             if mode == "prefix":
-                return [ql + "%" for _ in cols]
+                return [bound for _ in cols for bound in (ql, prefix_upper_bound(ql))]
             if mode == "substring":
                 return [f"%{ql}%" for _ in cols]
             return []
 
         modes = ("exact", "prefix", "substring") if match == "auto" else (match,)
 
-        rank_filter_sql = None
-        if rank_filter:
-            levels = sorted(int(r.value) for r in rank_filter)
-            placeholders = ",".join(str(v) for v in levels)
-            rank_filter_sql = f' AND "rankLevel" IN ({placeholders})'
+        levels = tuple(sorted(int(r.value) for r in rank_filter)) if rank_filter else ()
+        sup_limit = max(limit * 5, 50) if fuzzy else limit
 
         superset: List[sqlite3.Row] = []
 
         for mode in modes:
-            pred = make_predicates(mode)
-            if not pred.strip():
+            base_sql = _search_sql(tuple(cols), mode, levels)
+            if not base_sql:
                 continue
-            params = build_params(mode)
-            base_sql = (
-                'SELECT DISTINCT "taxonID", "name", "rankLevel", "immediateAncestor_taxonID", "commonName" '
-                "FROM expanded_taxa WHERE ("
-                + pred[4:]
-                + ") AND (\"taxonActive\" IS NULL OR CAST(\"taxonActive\" AS INTEGER)=1 OR LOWER(CAST(\"taxonActive\" AS TEXT)) IN ('1', 't', 'true'))"
-            )
-            if rank_filter_sql:
-                base_sql += rank_filter_sql
-            sup_limit = max(limit * 5, 50) if fuzzy else limit
-            base_sql += f' ORDER BY "rankLevel" ASC, "name" ASC LIMIT {sup_limit}'
+            params = [*build_params(mode), sup_limit]
             rows = await loop.run_in_executor(
-                None, lambda: self._conn.execute(base_sql, tuple(params)).fetchall()
+                self._executor, lambda: self._conn.execute(base_sql, tuple(params)).fetchall()
             )
             superset = rows
             if rows:
                 break
 
         results: List[Tuple[Taxon, float]] = []
-        for r in superset:
-            row_dict = dict(r)
+        row_dicts = [dict(r) for r in superset]
+        scores = (
+            score_search_rows(q_norm, row_dicts, scopes=scopes) if fuzzy else [1.0] * len(row_dicts)
+        )
+        for row_dict, sc in zip(row_dicts, scores):
             tax = taxon_from_search_row(
                 row_dict,
                 ancestry=[],
             )
-            sc = (
-                score_taxon_match(
-                    q_norm,
-                    scientific_name=row_dict.get("name"),
-                    vernacular_name=row_dict.get("commonName"),
-                    scopes=scopes,
-                )
-                if fuzzy
-                else 1.0
-            )
             if not fuzzy or sc >= threshold:
                 results.append((tax, sc))
 
@@ -432,7 +475,7 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
         placeholders = ",".join(["?" for _ in ids])
         sql = f'SELECT "taxonID", "name", "rankLevel", "immediateAncestor_taxonID", "commonName" FROM expanded_taxa WHERE "taxonID" IN ({placeholders})'
         rows = await loop.run_in_executor(
-            None, lambda: self._conn.execute(sql, tuple(ids)).fetchall()
+            self._executor, lambda: self._conn.execute(sql, tuple(ids)).fetchall()
         )
         out: dict[int, Taxon] = {}
         for r in rows:
@@ -454,7 +497,7 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
     ) -> TaxonSummary:
         loop = asyncio.get_running_loop()
         row = await loop.run_in_executor(
-            None,
+            self._executor,
             lambda: self._conn.execute(
                 'SELECT * FROM "expanded_taxa" WHERE "taxonID"=?', (taxon_id,)
             ).fetchone(),
@@ -469,9 +512,7 @@ class SQLiteTaxonomyService(AbstractTaxonomyService):
             if major_ranks_only and tid != taxon_id and not is_major(lvl):
                 continue
 
-            prefix = col_prefix_for_level(lvl)
-            name_col = f"{prefix}_name"
-            common_col = f"{prefix}_commonName"
+            name_col, common_col = NAME_COLUMNS[lvl]
 
             scientific_name = row[name_col] if name_col in row.keys() else None
             vernacular_name = row[common_col] if common_col in row.keys() else None